@@ -0,0 +1,157 @@
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from .mock_brb import MockBRBServer, synthetic_workbook
+from ..etl.download_manager import get_requests_session, load_sources_config, process_source
+from ..etl.segmented import DEFAULT_SEGMENT_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+def write_bench_config(project_root: Path, server: MockBRBServer, nodes: list) -> Path:
+    """Write a sources.yml pointing every source at a node page of the mock server"""
+    sources = {
+        f"source_{node}": {
+            "url": f"{server.base_url}/node/{node}",
+            "local_subdir": f"data/raw/source_{node}",
+            "pattern": r"IV\.5\.Importations.*\.(xlsx|xls)",
+        }
+        for node in nodes
+    }
+    config_path = project_root / "config" / "sources.yml"
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(config_path, "w", encoding="utf-8") as f:
+        yaml.safe_dump({"sources": sources}, f, sort_keys=False)
+    return config_path
+
+def summarize(latencies: list) -> dict:
+    if not latencies:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    values = np.array(latencies)
+    return {
+        "p50": round(float(np.percentile(values, 50)), 4),
+        "p95": round(float(np.percentile(values, 95)), 4),
+        "p99": round(float(np.percentile(values, 99)), 4),
+        "max": round(float(values.max()), 4),
+    }
+
+def run_scenario(
+    sources: int,
+    years: int,
+    faults: dict = None,
+    repeat: int = 1,
+    seed: int = 0,
+    segments: int = 0
+) -> dict:
+    """
+    Download `sources` workbooks of `years` years each from a fresh mock
+    server, `repeat` times, through the regular download path (page
+    discovery, versioned save, blob store, catalog), as `segments`
+    parallel byte ranges when segments > 1. Returns wall time,
+    throughput, per-source latency percentiles, failures and the number
+    of HTTP requests the server saw per source (retries included).
+    """
+    workbooks = {
+        477 + i: (f"IV.5.Importations_par_pays_{i}.xlsx", synthetic_workbook(years, seed=seed + i))
+        for i in range(sources)
+    }
+    workbook_bytes = sum(len(content) for _, content in workbooks.values())
+    latencies, errors = [], {}
+    downloaded = 0
+    wall = 0.0
+
+    with MockBRBServer(workbooks, faults, seed=seed) as server:
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory(prefix="brb-bench-") as tmp:
+                project_root = Path(tmp)
+                config_path = write_bench_config(project_root, server, list(workbooks))
+                entries = load_sources_config(config_path)
+                session = get_requests_session(pool_maxsize=max(sources, segments, 1))
+                segment_settings = {**DEFAULT_SEGMENT_SETTINGS, "segments": segments, "min_size": 0}
+                start = time.perf_counter()
+                for name, entry in entries.items():
+                    t0 = time.perf_counter()
+                    try:
+                        saved = process_source(name, entry, project_root, session, segments=segment_settings)
+                        downloaded += saved.stat().st_size
+                        latencies.append(time.perf_counter() - t0)
+                    except Exception as e:
+                        kind = type(e).__name__
+                        errors[kind] = errors.get(kind, 0) + 1
+                        logger.info(f"[{name}] {kind}: {e}")
+                wall += time.perf_counter() - start
+                session.close()
+        stats = server.stats
+
+    attempts = sources * repeat
+    return {
+        "sources": sources,
+        "years": years,
+        "repeat": repeat,
+        "workbook_kib": round(workbook_bytes / sources / 1024, 1),
+        "wall_s": round(wall, 3),
+        "throughput_mib_s": round(downloaded / wall / 2**20, 2) if wall else None,
+        "latency_s": summarize(latencies),
+        "succeeded": len(latencies),
+        "failed": attempts - len(latencies),
+        "errors": errors,
+        "requests_per_source": round(stats["requests"] / attempts, 2),
+        "server_statuses": {str(k): v for k, v in sorted(stats["by_status"].items())},
+        "truncated": stats["truncated"],
+    }
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Measure download throughput, latency and retries against a mock BRB site")
+    parser.add_argument("--sources", type=int, nargs="+", default=[1, 4, 16], help="Source counts to test")
+    parser.add_argument("--years", type=int, nargs="+", default=[3, 20], help="Workbook sizes, in years of data")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario")
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected seconds before each response")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 429/503")
+    parser.add_argument("--body-rate", type=int, default=0, help="Body throughput in bytes/s (0 = unthrottled)")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="Fraction of workbook bodies cut short")
+    parser.add_argument("--segments", type=int, default=0,
+                        help="Download each workbook as this many parallel byte ranges (0 = single stream)")
+    parser.add_argument("--no-ranges", action="store_true", help="Make the mock server ignore Range requests")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for workbooks and injected faults")
+    parser.add_argument("--output-json", "-o", help="Write the results to this JSON file", default=None)
+    parser.add_argument("--verbose", "-v", help="Show detailed progress messages", action="store_true")
+    args = parser.parse_args()
+
+    level = logging.INFO if args.verbose else logging.WARNING
+    logging.basicConfig(level=level, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    faults = {
+        "latency": args.latency,
+        "latency_jitter": args.latency_jitter,
+        "error_rate": args.error_rate,
+        "body_rate": args.body_rate,
+        "truncate_rate": args.truncate_rate,
+        "ranges": not args.no_ranges,
+    }
+    results = []
+    print(f"{'sources':>7} {'years':>5} {'KiB':>7} {'wall s':>8} {'MiB/s':>7} {'p50 s':>7} {'p95 s':>7} "
+          f"{'p99 s':>7} {'failed':>6} {'req/src':>7}")
+    for sources in args.sources:
+        for years in args.years:
+            result = run_scenario(sources, years, faults, args.repeat, args.seed, args.segments)
+            results.append(result)
+            lat = result["latency_s"]
+            fmt = lambda v: f"{v:7.3f}" if v is not None else f"{'-':>7}"
+            print(f"{sources:>7} {years:>5} {result['workbook_kib']:>7} {result['wall_s']:>8.3f} "
+                  f"{result['throughput_mib_s'] or 0:>7.2f} {fmt(lat['p50'])} {fmt(lat['p95'])} {fmt(lat['p99'])} "
+                  f"{result['failed']:>6} {result['requests_per_source']:>7}")
+
+    if args.output_json:
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump({"faults": faults, "segments": args.segments, "results": results}, f, indent=2)
+        print(f"Results written to {args.output_json}")
+
+if __name__ == "__main__":
+    main()
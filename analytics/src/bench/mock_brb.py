@@ -0,0 +1,285 @@
+import base64
+import hashlib
+import io
+import logging
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import Workbook
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the fault injection knobs of MockBRBServer
+DEFAULT_FAULTS = {
+    "latency": 0.0,               # seconds before the response headers
+    "latency_jitter": 0.0,        # extra uniform random latency, in seconds
+    "error_rate": 0.0,            # fraction of requests answered with an error status
+    "error_statuses": [429, 503], # statuses picked from for injected errors
+    "retry_after": 1,             # Retry-After header sent with 429/503
+    "body_rate": 0,               # bytes per second for response bodies (0 = unthrottled)
+    "truncate_rate": 0.0,         # fraction of workbook responses cut off half way
+    "ranges": True,               # honour Range requests for workbooks (Accept-Ranges: bytes)
+}
+
+def synthetic_workbook(years: int = 3, seed: int = 0, start_year: int = 2003) -> bytes:
+    """
+    Build an .xlsx in the layout of the BRB "IV.5 Importations par pays"
+    release: title rows, a "Pays de destination" header with one column per
+    month, one row per country of the reference CSV, continent subtotals and
+    a TOTAL row. The workbook grows linearly with years.
+    """
+    rng = random.Random(seed)
+    reference = Path(__file__).resolve().parents[1] / "parse" / "importation_countries" / "countries.csv"
+    countries = pd.read_csv(reference)
+    months = [datetime(start_year + m // 12, m % 12 + 1, 1) for m in range(12 * years)]
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Mensuelle"
+    ws.append(["BANQUE DE LA REPUBLIQUE DU BURUNDI"])
+    ws.append(["IV.5 Importations par pays de provenance (en millions de BIF)"])
+    ws.append([])
+    ws.append(["Pays de destination"] + months)
+    total = [0.0] * len(months)
+    for continent, group in countries.groupby("continent", sort=False):
+        subtotal = [0.0] * len(months)
+        for country in group["country"]:
+            values = [round(rng.uniform(0, 500), 1) for _ in months]
+            ws.append([country] + values)
+            subtotal = [a + b for a, b in zip(subtotal, values)]
+        ws.append([continent.capitalize()] + subtotal)
+        total = [a + b for a, b in zip(total, subtotal)]
+    ws.append(["TOTAL"] + total)
+    ws.append(["Source: BRB"])
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+class MockBRBServer:
+    """
+    Local stand-in for brb.bi. Serves one node page per source
+    (/node/<id>) linking to its workbook under /sites/default/files/, with
+    ETag / Last-Modified, HEAD and single byte-range (Range / If-Range)
+    support and a Repr-Digest of each workbook, and injects faults (latency, 429/5xx,
+    throttled bodies, truncated transfers) as configured in faults.
+    Faults are drawn from a seeded RNG so runs are repeatable. Every
+    request is counted in stats, by path and status.
+    """
+
+    def __init__(self, workbooks: dict, faults: dict = None, seed: int = 0, host: str = "127.0.0.1", port: int = 0):
+        """workbooks: node id -> (file name, workbook bytes)"""
+        self.faults = {**DEFAULT_FAULTS, **(faults or {})}
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "by_status": {}, "by_path": {}, "truncated": 0}
+        self.routes = {}
+        last_modified = formatdate(time.time(), usegmt=True)
+        for node, (filename, content) in workbooks.items():
+            file_path = f"/sites/default/files/{filename}"
+            page = (
+                "<html><body><h1>Statistiques</h1><ul>"
+                f'<li><a href="/sites/default/files/notice_{node}.pdf">Notice</a></li>'
+                f'<li><a href="{file_path}">{filename}</a></li>'
+                "</ul></body></html>"
+            ).encode("utf-8")
+            self.routes[f"/node/{node}"] = ("text/html; charset=utf-8", page, None)
+            self.routes[file_path] = (
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                content,
+                {
+                    "ETag": f'"{hashlib.sha256(content).hexdigest()[:16]}"',
+                    "Last-Modified": last_modified,
+                    "Repr-Digest": f"sha-256=:{base64.b64encode(hashlib.sha256(content).digest()).decode()}:",
+                },
+            )
+        self.httpd = ThreadingHTTPServer((host, port), self.handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw(self, probability: float) -> bool:
+        with self.lock:
+            return probability > 0 and self.rng.random() < probability
+
+    def count(self, path: str, status: int, truncated: bool = False):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["by_status"][status] = self.stats["by_status"].get(status, 0) + 1
+            self.stats["by_path"][path] = self.stats["by_path"].get(path, 0) + 1
+            self.stats["truncated"] += int(truncated)
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {"requests": 0, "by_status": {}, "by_path": {}, "truncated": 0}
+
+    def handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this every response waits on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def do_HEAD(self):
+                self.do_GET(head=True)
+
+            def do_GET(self, head: bool = False):
+                faults = server.faults
+                delay = faults["latency"]
+                if faults["latency_jitter"]:
+                    with server.lock:
+                        delay += server.rng.uniform(0, faults["latency_jitter"])
+                if delay:
+                    time.sleep(delay)
+
+                path = self.path.split("?", 1)[0]
+                route = server.routes.get(path)
+                if route is None:
+                    return self.send_status(path, 404)
+                if server.draw(faults["error_rate"]):
+                    with server.lock:
+                        status = server.rng.choice(faults["error_statuses"])
+                    return self.send_status(path, status, {"Retry-After": str(faults["retry_after"])})
+
+                content_type, body, validators = route
+                validators = validators or {}
+                if validators and self.headers.get("If-None-Match") == validators["ETag"]:
+                    return self.send_status(path, 304, validators)
+
+                status, headers = 200, dict(validators)
+                ranged = bool(validators) and faults["ranges"]
+                if ranged:
+                    headers["Accept-Ranges"] = "bytes"
+                    byte_range = self.requested_range(len(body), validators)
+                    if byte_range == "unsatisfiable":
+                        return self.send_status(path, 416, {"Content-Range": f"bytes */{len(body)}"})
+                    if byte_range is not None:
+                        start, end = byte_range
+                        status = 206
+                        headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+                        body = body[start:end + 1]
+
+                truncated = not head and bool(validators) and server.draw(faults["truncate_rate"])
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                if truncated:
+                    self.send_header("Connection", "close")
+                self.end_headers()
+                server.count(path, status, truncated)
+                if head:
+                    return
+                self.write_body(body[: len(body) // 2] if truncated else body)
+                if truncated:
+                    self.close_connection = True
+
+            def requested_range(self, length: int, validators: dict):
+                """
+                (start, end) of a satisfiable single-range request, "unsatisfiable",
+                or None to send the whole body (no Range, or If-Range is stale)
+                """
+                match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", "").strip())
+                if match is None or not any(match.groups()):
+                    return None
+                if_range = self.headers.get("If-Range")
+                if if_range and if_range not in (validators["ETag"], validators["Last-Modified"]):
+                    return None
+                first, last = match.groups()
+                if not first:
+                    start, end = max(length - int(last), 0), length - 1
+                else:
+                    start, end = int(first), min(int(last), length - 1) if last else length - 1
+                if start >= length or start > end:
+                    return "unsatisfiable"
+                return start, end
+
+            def write_body(self, body: bytes):
+                rate = server.faults["body_rate"]
+                if not rate:
+                    self.wfile.write(body)
+                    return
+                chunk = max(int(rate) // 20, 1)
+                for start in range(0, len(body), chunk):
+                    self.wfile.write(body[start:start + chunk])
+                    self.wfile.flush()
+                    time.sleep(chunk / rate)
+
+            def send_status(self, path: str, status: int, headers: dict = None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                server.count(path, status)
+
+            def log_message(self, format, *args):
+                logger.debug(f"{self.address_string()} {format % args}")
+
+        return Handler
+
+    def start(self) -> "MockBRBServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Mock BRB site listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve a local mock of the BRB statistics pages")
+    parser.add_argument("--port", type=int, default=8477, help="Port to listen on (default 8477)")
+    parser.add_argument("--sources", type=int, default=2, help="Number of node pages / workbooks")
+    parser.add_argument("--years", type=int, default=3, help="Years of monthly data per workbook")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 429/503")
+    parser.add_argument("--body-rate", type=int, default=0, help="Body throughput in bytes/s (0 = unthrottled)")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="Fraction of workbook bodies cut short")
+    parser.add_argument("--no-ranges", action="store_true", help="Ignore Range requests (no Accept-Ranges)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the workbooks and injected faults")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    workbooks = {
+        477 + i: (f"IV.5.Importations_par_pays_{i}.xlsx", synthetic_workbook(args.years, seed=args.seed + i))
+        for i in range(args.sources)
+    }
+    faults = {
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "body_rate": args.body_rate,
+        "truncate_rate": args.truncate_rate,
+        "ranges": not args.no_ranges,
+    }
+    server = MockBRBServer(workbooks, faults, seed=args.seed, port=args.port).start()
+    for node in workbooks:
+        print(f"{server.base_url}/node/{node}")
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from .mock_brb import synthetic_workbook
+from ..etl.blob_store import workbook_suffix
+from ..parse.engine import READER_ENGINES, engine_available, get_parser
+
+logger = logging.getLogger(__name__)
+
+def compare_frames(reference: dict, frames: dict) -> list:
+    """Differences between two parse_workbook results, as messages (empty when identical)"""
+    problems = []
+    if set(reference) != set(frames):
+        problems.append(f"sheets differ: {sorted(reference)} vs {sorted(frames)}")
+    for granularity in sorted(set(reference) & set(frames)):
+        try:
+            pd.testing.assert_frame_equal(reference[granularity], frames[granularity], check_exact=True)
+        except AssertionError as e:
+            problems.append(f"{granularity}: {str(e).splitlines()[0]}")
+    return problems
+
+def bench_workbook(parser, excel_path: Path, repeat: int) -> dict:
+    """
+    Parse excel_path with every installed engine, check the frames and
+    validation reports are identical to the first engine's, and time each.
+    Returns {engine: {"best_s", "mean_s", "problems"}}.
+    """
+    results = {}
+    reference = None
+    for engine in READER_ENGINES[workbook_suffix(excel_path)]:
+        if not engine_available(engine):
+            logger.info(f"{engine} not installed, skipped")
+            continue
+        parser.reader = engine
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            frames = parser.parse_workbook(excel_path)
+            timings.append(time.perf_counter() - start)
+        output = (frames, parser.reports)
+        if reference is None:
+            reference = output
+            problems = []
+        else:
+            problems = compare_frames(reference[0], frames)
+            if reference[1] != parser.reports:
+                problems.append("validation reports differ")
+        results[engine] = {
+            "best_s": min(timings),
+            "mean_s": sum(timings) / len(timings),
+            "problems": problems,
+        }
+    return results
+
+def main():
+    import argparse
+    arg_parser = argparse.ArgumentParser(
+        description="Check that every Excel reader engine parses identically, and compare their speed")
+    arg_parser.add_argument("--dataset", "-d", default="importation_countries",
+                            help="Dataset descriptor used to parse the workbooks (default importation_countries)")
+    arg_parser.add_argument("--years", type=int, nargs="+", default=[3, 25],
+                            help="Sizes of the synthetic countries workbooks, in years (used when no files are given)")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Parses per engine and workbook")
+    arg_parser.add_argument("--verbose", "-v", help="Show detailed progress messages", action="store_true")
+    arg_parser.add_argument("files", nargs="*", help="Workbooks to check (default: synthetic workbooks)")
+    args = arg_parser.parse_args()
+
+    level = logging.INFO if args.verbose else logging.WARNING
+    logging.basicConfig(level=level, format="%(asctime)s [%(levelname)s] %(message)s")
+    if not args.verbose:
+        # Unmatched-label and validation warnings repeat for every parse
+        logging.getLogger(get_parser.__module__).setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory(prefix="brb-readers-") as tmp:
+        workbooks = [Path(f) for f in args.files]
+        if not workbooks:
+            for years in args.years:
+                path = Path(tmp) / f"synthetic_{years}y.xlsx"
+                path.write_bytes(synthetic_workbook(years))
+                workbooks.append(path)
+
+        parser = get_parser(args.dataset, data_root=Path(tmp))
+        mismatches = 0
+        print(f"{'workbook':<32} {'KiB':>7} {'engine':<10} {'best s':>8} {'mean s':>8} {'speedup':>8}  parity")
+        for excel_path in workbooks:
+            results = bench_workbook(parser, excel_path, args.repeat)
+            slowest = max(r["best_s"] for r in results.values())
+            for engine, result in results.items():
+                mismatches += len(result["problems"])
+                parity = "; ".join(result["problems"]) or "identical"
+                print(f"{excel_path.name[:32]:<32} {excel_path.stat().st_size / 1024:>7.0f} {engine:<10} "
+                      f"{result['best_s']:>8.3f} {result['mean_s']:>8.3f} {slowest / result['best_s']:>7.1f}x  {parity}")
+
+    if mismatches:
+        raise SystemExit(f"{mismatches} parity problem(s) between reader engines")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import gzip
+import hashlib
+import io
+import logging
+import os
+import shutil
+from pathlib import Path
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Suffix of the pointer files used as references to compressed blobs
+REF_SUFFIX = ".ref"
+
+class BlobStore:
+    """
+    Content-addressed store for raw downloads.
+    Each distinct file is stored once under blobs/sha256/<2 hex>/<digest><ext>
+    (gzip-compressed with a .gz suffix when compress=True). The dated,
+    human-readable names under data/raw/ are lightweight references to it:
+    hard links for plain blobs, small "<name>.ref" pointer files for
+    compressed ones. The blob digest doubles as the key for anything cached
+    downstream of a download.
+    """
+
+    def __init__(self, root: Path, compress: bool = False):
+        self.root = Path(root)
+        self.compress = compress
+
+    def path_for(self, digest: str, ext: str) -> Path:
+        name = f"{digest}{ext}" + (".gz" if self.compress else "")
+        return self.root / "sha256" / digest[:2] / name
+
+    def put(self, content: bytes, ext: str) -> tuple:
+        """Store content unless already present; returns (digest, blob path)"""
+        digest = hashlib.sha256(content).hexdigest()
+        blob = self.path_for(digest, ext)
+        if blob.exists():
+            logger.info(f"Blob already stored: {blob.name}")
+            return digest, blob
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(blob.name + ".tmp")
+        if self.compress:
+            with gzip.open(tmp, "wb") as f:
+                f.write(content)
+        else:
+            with open(tmp, "wb") as f:
+                f.write(content)
+        tmp.replace(blob)
+        logger.info(f"Stored blob: {blob}")
+        return digest, blob
+
+    def link(self, digest: str, blob: Path, dest: Path) -> Path:
+        """
+        Create the human-readable reference dest for a stored blob and return
+        its path (dest, or dest + ".ref" for compressed blobs).
+        """
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if self.compress:
+            ref = dest.with_name(dest.name + REF_SUFFIX)
+            ref.write_text(f"sha256:{digest}\n{blob.relative_to(self.root).as_posix()}\n", encoding="utf-8")
+            return ref
+
+        if dest.exists() or dest.is_symlink():
+            dest.unlink()
+        try:
+            os.link(blob, dest)
+        except OSError:
+            # Hard links unavailable (other filesystem, some Windows setups)
+            try:
+                dest.symlink_to(blob.resolve())
+            except OSError:
+                shutil.copyfile(blob, dest)
+        return dest
+
+    def store(self, content: bytes, dest: Path) -> tuple:
+        """Store content and reference it as dest; returns (digest, reference path)"""
+        digest, blob = self.put(content, dest.suffix)
+        return digest, self.link(digest, blob, dest)
+
+    def read_ref(self, ref: Path) -> Path:
+        lines = Path(ref).read_text(encoding="utf-8").split()
+        return self.root / lines[1]
+
+    def gc(self, referenced: set) -> list:
+        """
+        Delete blobs whose digest is not in referenced (e.g. the content
+        hashes of the raw artifacts still in the catalog). Returns the paths.
+        """
+        removed = []
+        base = self.root / "sha256"
+        if not base.exists():
+            return removed
+        for blob in base.glob("*/*"):
+            digest = blob.name.split(".")[0]
+            if digest not in referenced:
+                blob.unlink()
+                removed.append(blob)
+                logger.info(f"Removed unreferenced blob: {blob.name}")
+        return removed
+
+def reference_digest(path: Path) -> str:
+    """Return the content digest behind a raw file or .ref pointer"""
+    path = Path(path)
+    if path.suffix == REF_SUFFIX:
+        return path.read_text(encoding="utf-8").split()[0].split(":", 1)[1]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def open_workbook_source(path: Path, blob_root: Path):
+    """
+    Return something the Excel readers can open for a raw file: the path
+    itself, or the decompressed blob bytes behind a .ref pointer.
+    """
+    path = Path(path)
+    if path.suffix != REF_SUFFIX:
+        return path
+    blob = BlobStore(blob_root).read_ref(path)
+    opener = gzip.open if blob.suffix == ".gz" else open
+    with opener(blob, "rb") as f:
+        return io.BytesIO(f.read())
+
+def workbook_suffix(path: Path) -> str:
+    """Workbook extension of a raw file, looking through a .ref suffix"""
+    path = Path(path)
+    if path.suffix == REF_SUFFIX:
+        path = path.with_suffix("")
+    return path.suffix.lower()
+
+def load_blob_store(project_root: Path, config_path: Path = None) -> BlobStore:
+    """Blob store under data/blobs, configured by the optional `blob_store:` section of sources.yml"""
+    settings = {}
+    if config_path is not None and Path(config_path).exists():
+        with open(config_path, "r", encoding="utf-8") as f:
+            settings = (yaml.safe_load(f) or {}).get("blob_store") or {}
+    return BlobStore(Path(project_root) / "data" / "blobs", compress=bool(settings.get("compress", False)))
@@ -0,0 +1,337 @@
+import hashlib
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import yaml
+
+from .blob_store import reference_digest
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE,
+    dataset TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_dataset_stage ON artifacts (dataset, stage, created_at);
+CREATE TABLE IF NOT EXISTS lineage (
+    artifact_id INTEGER NOT NULL REFERENCES artifacts (id) ON DELETE CASCADE,
+    upstream_id INTEGER NOT NULL REFERENCES artifacts (id) ON DELETE CASCADE,
+    PRIMARY KEY (artifact_id, upstream_id)
+);
+CREATE TABLE IF NOT EXISTS latest (
+    dataset TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    artifact_id INTEGER NOT NULL REFERENCES artifacts (id) ON DELETE CASCADE,
+    PRIMARY KEY (dataset, stage)
+);
+"""
+
+# Where `scan` looks for artifacts written before the catalog existed:
+# (stage, directory under the project root, glob pattern)
+SCAN_LAYOUT = [
+    ("raw", "data/raw/{dataset}", "*.xls*"),
+    ("parsed-monthly", "data/parsed/{dataset}", "*-monthly.csv"),
+    ("parsed-quarterly", "data/parsed/{dataset}", "*-quarterly.csv"),
+    ("parsed-annual", "data/parsed/{dataset}", "*-annual.csv"),
+    ("transformed", "data/parsed/{dataset}", "*-monthly-transformed.json"),
+]
+
+DEFAULT_RETENTION = {
+    "keep": 3,
+    "max_age_days": None,
+}
+
+def file_hash(path: Path) -> str:
+    """Return the sha256 hex digest of a file, read in 1 MiB blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class Catalog:
+    """
+    SQLite index of every artifact the pipeline writes (raw downloads,
+    parsed CSVs, transformed JSON, ...): path, dataset, stage, content
+    hash, upstream lineage and creation time.
+    A (dataset, stage) -> artifact table keeps "latest" lookups to a single
+    primary-key read however many runs have accumulated.
+    """
+
+    def __init__(self, project_root: Path, db_path: Path = None):
+        self.project_root = Path(project_root)
+        self.db_path = Path(db_path or self.project_root / "data" / "catalog.sqlite")
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def relative(self, path: Path) -> str:
+        path = Path(path).resolve()
+        try:
+            return path.relative_to(self.project_root.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def resolve(self, stored_path: str) -> Path:
+        return self.project_root / stored_path
+
+    def register(
+        self,
+        path: Path,
+        dataset: str,
+        stage: str,
+        upstream: list = (),
+        content_hash: str = None,
+        created_at: datetime = None
+    ) -> int:
+        """
+        Record an artifact (re-registering a path replaces its entry) and make
+        it the latest for its dataset and stage. upstream lists the ids of the
+        artifacts it was built from. Returns the artifact id.
+        """
+        content_hash = content_hash or file_hash(path)
+        created = (created_at or datetime.now()).isoformat(timespec="seconds")
+        rel = self.relative(path)
+        with self.conn:
+            existing = self.conn.execute("SELECT id FROM artifacts WHERE path = ?", (rel,)).fetchone()
+            if existing:
+                # Same file rewritten (e.g. a second run on the same day): keep its id
+                # so downstream lineage stays attached
+                artifact_id = existing["id"]
+                self.conn.execute(
+                    "UPDATE artifacts SET dataset = ?, stage = ?, content_hash = ?, created_at = ? WHERE id = ?",
+                    (dataset, stage, content_hash, created, artifact_id),
+                )
+                self.conn.execute("DELETE FROM lineage WHERE artifact_id = ?", (artifact_id,))
+            else:
+                cur = self.conn.execute(
+                    "INSERT INTO artifacts (path, dataset, stage, content_hash, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (rel, dataset, stage, content_hash, created),
+                )
+                artifact_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO lineage (artifact_id, upstream_id) VALUES (?, ?)",
+                [(artifact_id, up) for up in upstream if up is not None and up != artifact_id],
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO latest (dataset, stage, artifact_id) VALUES (?, ?, ?)",
+                (dataset, stage, artifact_id),
+            )
+        logger.info(f"Cataloged {stage} artifact for {dataset}: {rel}")
+        return artifact_id
+
+    def latest(self, dataset: str, stage: str):
+        """Return the latest artifact row for a dataset and stage, or None"""
+        return self.conn.execute(
+            "SELECT a.* FROM latest l JOIN artifacts a ON a.id = l.artifact_id"
+            " WHERE l.dataset = ? AND l.stage = ?",
+            (dataset, stage),
+        ).fetchone()
+
+    def latest_path(self, dataset: str, stage: str) -> Path:
+        row = self.latest(dataset, stage)
+        return self.resolve(row["path"]) if row else None
+
+    def find(self, path: Path):
+        return self.conn.execute(
+            "SELECT * FROM artifacts WHERE path = ?", (self.relative(path),)
+        ).fetchone()
+
+    def upstream(self, artifact_id: int) -> list:
+        return self.conn.execute(
+            "SELECT a.* FROM lineage l JOIN artifacts a ON a.id = l.upstream_id WHERE l.artifact_id = ?",
+            (artifact_id,),
+        ).fetchall()
+
+    def derived_from(self, dataset: str, stage: str, content_hash: str):
+        """
+        Return the newest artifact of a dataset and stage built from an
+        upstream artifact with the given content hash (e.g. a raw blob), or None.
+        """
+        return self.conn.execute(
+            "SELECT a.* FROM artifacts a"
+            " JOIN lineage l ON l.artifact_id = a.id"
+            " JOIN artifacts u ON u.id = l.upstream_id"
+            " WHERE a.dataset = ? AND a.stage = ? AND u.content_hash = ?"
+            " ORDER BY a.created_at DESC, a.id DESC LIMIT 1",
+            (dataset, stage, content_hash),
+        ).fetchone()
+
+    def artifacts(self, dataset: str = None, stage: str = None) -> list:
+        query = "SELECT * FROM artifacts WHERE (? IS NULL OR dataset = ?) AND (? IS NULL OR stage = ?)"
+        query += " ORDER BY dataset, stage, created_at DESC, id DESC"
+        return self.conn.execute(query, (dataset, dataset, stage, stage)).fetchall()
+
+    def refresh_latest(self, dataset: str, stage: str):
+        row = self.conn.execute(
+            "SELECT id FROM artifacts WHERE dataset = ? AND stage = ? ORDER BY created_at DESC, id DESC LIMIT 1",
+            (dataset, stage),
+        ).fetchone()
+        if row:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO latest (dataset, stage, artifact_id) VALUES (?, ?, ?)",
+                (dataset, stage, row["id"]),
+            )
+
+    def prune(self, policy: dict = None, dry_run: bool = False) -> list:
+        """
+        Delete superseded artifacts (files and entries).
+        For every dataset and stage the newest `keep` artifacts are kept; older
+        ones are removed, or only once older than `max_age_days` when set.
+        Per-stage overrides go under `stages:`. Artifacts that a kept
+        artifact was built from are never removed.
+        Returns the removed (or, with dry_run, removable) paths.
+        """
+        policy = {**DEFAULT_RETENTION, **(policy or {})}
+        now = datetime.now()
+        candidates = set()
+        groups = {}
+        for row in self.artifacts():
+            groups.setdefault((row["dataset"], row["stage"]), []).append(row)
+        for (dataset, stage), rows in groups.items():
+            rules = {**policy, **(policy.get("stages") or {}).get(stage, {})}
+            for row in rows[int(rules["keep"]):]:
+                age = now - datetime.fromisoformat(row["created_at"])
+                if rules["max_age_days"] is None or age > timedelta(days=rules["max_age_days"]):
+                    candidates.add(row["id"])
+
+        # Keep the lineage of every surviving artifact
+        kept = [row["id"] for row in self.artifacts() if row["id"] not in candidates]
+        while kept:
+            ups = [up["id"] for aid in kept for up in self.upstream(aid) if up["id"] in candidates]
+            candidates.difference_update(ups)
+            kept = ups
+
+        removed = []
+        for row in self.artifacts():
+            if row["id"] not in candidates:
+                continue
+            path = self.resolve(row["path"])
+            removed.append(path)
+            if dry_run:
+                continue
+            if path.exists():
+                path.unlink()
+            with self.conn:
+                self.conn.execute("DELETE FROM artifacts WHERE id = ?", (row["id"],))
+                self.refresh_latest(row["dataset"], row["stage"])
+            logger.info(f"Pruned {row['stage']} artifact for {row['dataset']}: {row['path']}")
+        return removed
+
+    def scan(self) -> int:
+        """Index artifacts already on disk that are not cataloged yet; returns the count"""
+        added = 0
+        for stage, directory, pattern in SCAN_LAYOUT:
+            base = self.project_root / directory.split("/{dataset}")[0]
+            if not base.exists():
+                continue
+            for dataset_dir in sorted(p for p in base.iterdir() if p.is_dir()):
+                files = sorted(dataset_dir.glob(pattern), key=lambda p: p.stat().st_mtime)
+                for path in files:
+                    if self.find(path) is None:
+                        created = datetime.fromtimestamp(path.stat().st_mtime)
+                        # Raw files may be blob references: catalog the blob digest
+                        digest = reference_digest(path) if stage == "raw" else None
+                        self.register(path, dataset_dir.name, stage, content_hash=digest, created_at=created)
+                        added += 1
+        return added
+
+def find_latest(project_root: Path, dataset: str, stage: str, directory: Path, pattern: str) -> tuple:
+    """
+    Look up the latest artifact of a dataset and stage in the catalog.
+    Falls back to the most recently written file matching pattern in
+    directory for trees written before the catalog existed.
+    Returns (path, artifact id or None).
+    """
+    with Catalog(project_root) as catalog:
+        row = catalog.latest(dataset, stage)
+        if row and catalog.resolve(row["path"]).exists():
+            return catalog.resolve(row["path"]), row["id"]
+    candidates = sorted(Path(directory).glob(pattern), key=lambda p: (p.stat().st_mtime, p.name))
+    if not candidates:
+        raise FileNotFoundError(f"No {stage} artifacts for {dataset} in catalog or in {directory}")
+    return candidates[-1], None
+
+def load_retention_policy(config_path: Path) -> dict:
+    """Read the optional top-level `retention:` section of sources.yml"""
+    with open(config_path, "r", encoding="utf-8") as f:
+        cfg_all = yaml.safe_load(f) or {}
+    return {**DEFAULT_RETENTION, **(cfg_all.get("retention") or {})}
+
+def main():
+    import argparse
+    from .blob_store import load_blob_store
+    from .download_manager import get_project_root
+    parser = argparse.ArgumentParser(description="Inspect and prune the artifact catalog")
+    parser.add_argument("--verbose", "-v", help="Show detailed progress messages", action="store_true")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    list_cmd = sub.add_parser("list", help="List cataloged artifacts")
+    list_cmd.add_argument("--dataset")
+    list_cmd.add_argument("--stage")
+
+    latest_cmd = sub.add_parser("latest", help="Print the latest artifact path of a dataset and stage")
+    latest_cmd.add_argument("dataset")
+    latest_cmd.add_argument("stage")
+
+    sub.add_parser("scan", help="Catalog artifacts already on disk")
+
+    prune_cmd = sub.add_parser("prune", help="Delete superseded artifacts")
+    prune_cmd.add_argument("--config", "-c", help="Path to config YAML (default config/sources.yml)", default=None)
+    prune_cmd.add_argument("--keep", type=int, help="Artifacts to keep per dataset and stage")
+    prune_cmd.add_argument("--max-age-days", type=float, help="Only prune artifacts older than this")
+    prune_cmd.add_argument("--dry-run", action="store_true", help="Only list what would be removed")
+
+    args = parser.parse_args()
+    level = logging.INFO if args.verbose else logging.WARNING
+    logging.basicConfig(level=level, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    with Catalog(get_project_root()) as catalog:
+        if args.command == "list":
+            for row in catalog.artifacts(args.dataset, args.stage):
+                print(f"{row['created_at']}  {row['dataset']:<24} {row['stage']:<18} {row['content_hash'][:12]}  {row['path']}")
+        elif args.command == "latest":
+            path = catalog.latest_path(args.dataset, args.stage)
+            if path is None:
+                raise SystemExit(f"No {args.stage} artifact for {args.dataset}")
+            print(path)
+        elif args.command == "scan":
+            print(f"Cataloged {catalog.scan()} existing artifacts")
+        elif args.command == "prune":
+            config_path = Path(args.config) if args.config else get_project_root() / "config" / "sources.yml"
+            policy = load_retention_policy(config_path)
+            if args.keep is not None:
+                policy["keep"] = args.keep
+            if args.max_age_days is not None:
+                policy["max_age_days"] = args.max_age_days
+            removed = catalog.prune(policy, dry_run=args.dry_run)
+            verb = "Would remove" if args.dry_run else "Removed"
+            for path in removed:
+                print(f"{verb}: {path}")
+            print(f"{verb} {len(removed)} artifacts")
+            if not args.dry_run:
+                # Raw downloads are references into the blob store; drop blobs nothing points to
+                referenced = {row["content_hash"] for row in catalog.artifacts(stage="raw")}
+                blobs = load_blob_store(catalog.project_root, config_path).gc(referenced)
+                print(f"Removed {len(blobs)} unreferenced blobs")
+
+if __name__ == "__main__":
+    main()
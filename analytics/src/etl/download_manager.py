@@ -15,6 +15,11 @@ import yaml
 
 import zlib
 
+from .blob_store import BlobStore, load_blob_store, reference_digest
+from .catalog import Catalog
+from .http_cache import CACHE_MODES, CachingAdapter, HttpCache, load_http_cache
+from .segmented import SegmentError, load_segment_settings, segmented_get
+
 logger = logging.getLogger(__name__)
 
 def get_project_root() -> Path:
@@ -67,11 +72,15 @@ def get_combined_ca_path() -> Path:
         # No project-specific intermediate found
         return None
 
-def get_requests_session() -> requests.Session:
+def get_requests_session(pool_maxsize: int = 10, cache: HttpCache = None) -> requests.Session:
     """
     Return a requests.Session with retries and SSL verification.
     Uses a combined CA bundle (certifi + project intermediate) if available,
     else falls back to certifi.where().
+    pool_maxsize bounds the kept-alive connections per host, so long-running
+    callers (e.g. watch mode) can reuse one warm session across polls.
+    With an HttpCache whose mode is not "off", responses are recorded to /
+    replayed from the on-disk cache (see src/etl/http_cache.py).
     """
     session = requests.Session()
     retries = Retry(
@@ -81,7 +90,11 @@ def get_requests_session() -> requests.Session:
         allowed_methods=["GET"],
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retries)
+    if cache is not None and cache.mode != "off":
+        adapter = CachingAdapter(cache, max_retries=retries, pool_maxsize=pool_maxsize)
+        logger.info(f"HTTP cache in {cache.mode} mode at: {cache.root}")
+    else:
+        adapter = HTTPAdapter(max_retries=retries, pool_maxsize=pool_maxsize)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
 
@@ -130,16 +143,11 @@ def discover_excel_link(page_url: str, pattern: str, session: requests.Session)
     raise ValueError(f"No link matching pattern {pattern!r} on page {page_url}")
 
 
-def download_and_version_file(
-    file_url: str,
-    save_dir: Path,
-    session: requests.Session,
-    sanitize_regex: str = r"[^\w\.-]"
-) -> Path:
-    logger.info(f"Downloading file from URL: {file_url}")
-    resp = session.get(file_url)
-    resp.raise_for_status()
-
+def versioned_filename(file_url: str, sanitize_regex: str = r"[^\w\.-]") -> str:
+    """
+    Return the dated local filename for file_url:
+    {crc32(url) % 100000}_{sanitized name}_{YYYYMMDD}{ext}
+    """
     orig_name = Path(file_url).name
     stem = Path(orig_name).stem
     # sanitize name
@@ -154,56 +162,130 @@ def download_and_version_file(
 
     date_str = datetime.now().strftime("%Y%m%d")
     ext = Path(orig_name).suffix or ""
-    new_filename = f"{prefix}_{sanitized}_{date_str}{ext}"
+    return f"{prefix}_{sanitized}_{date_str}{ext}"
+
+def save_versioned_content(
+    file_url: str,
+    content: bytes,
+    save_dir: Path,
+    sanitize_regex: str = r"[^\w\.-]",
+    store: BlobStore = None
+) -> Path:
+    """
+    Save downloaded content under its dated name in save_dir.
+    With a blob store the bytes are stored once, by content hash, and the
+    dated name is only a reference to the blob.
+    """
+    save_path = save_dir / versioned_filename(file_url, sanitize_regex)
+    if store is not None:
+        _, save_path = store.store(content, save_path)
+        logger.info(f"Saved reference to: {save_path}")
+        return save_path
 
     save_dir.mkdir(parents=True, exist_ok=True)
-    save_path = save_dir / new_filename
     # Open with 'wb' always overwrites if exists
     with open(save_path, "wb") as f:
-        f.write(resp.content)
+        f.write(content)
     logger.info(f"Saved file to: {save_path}")
     return save_path
 
+def download_and_version_file(
+    file_url: str,
+    save_dir: Path,
+    session: requests.Session,
+    sanitize_regex: str = r"[^\w\.-]",
+    store: BlobStore = None,
+    segments: dict = None
+) -> Path:
+    """
+    Download file_url and save it under its dated name. With segments
+    settings asking for more than one segment, large files are fetched as
+    parallel byte ranges when the server supports them (see
+    src/etl/segmented.py), falling back to a single stream otherwise.
+    """
+    logger.info(f"Downloading file from URL: {file_url}")
+    if segments and segments["segments"] > 1:
+        try:
+            content = segmented_get(file_url, session, segments["segments"], segments["min_size"])
+        except SegmentError as e:
+            logger.warning(f"Segmented download failed ({e}), retrying as a single stream")
+            content = None
+        if content is not None:
+            return save_versioned_content(file_url, content, save_dir, sanitize_regex, store)
+    resp = session.get(file_url)
+    resp.raise_for_status()
+    return save_versioned_content(file_url, resp.content, save_dir, sanitize_regex, store)
+
+def resolve_file_url(name: str, entry: dict, session: requests.Session) -> str:
+    """
+    Return the direct Excel URL for a source entry, discovering it on the
+    source page when the configured url is not itself a workbook link.
+    """
+    url = entry.get("url")
+    if not url:
+        raise ValueError(f"Source '{name}' missing 'url'")
+    if re.search(r"\.xls[x]?$", url, re.IGNORECASE):
+        return url
+    pattern = entry.get("pattern")
+    if not pattern:
+        raise ValueError(f"Source '{name}' needs 'pattern' for page {url}")
+    href = discover_excel_link(url, pattern, session)
+    return urljoin(url, href)
+
 def process_source(
     name: str,
     entry: dict,
     project_root: Path,
-    session: requests.Session
+    session: requests.Session,
+    store: BlobStore = None,
+    segments: dict = None
 ) -> Path:
-    url = entry.get("url")
-    if not url:
-        raise ValueError(f"Source '{name}' missing 'url'")
     local_subdir = entry.get("local_subdir")
     if not local_subdir:
         raise ValueError(f"Source '{name}' missing 'local_subdir'")
     save_dir = project_root / local_subdir
 
-    if re.search(r"\.xls[x]?$", url, re.IGNORECASE):
-        file_url = url
-    else:
-        pattern = entry.get("pattern")
-        if not pattern:
-            raise ValueError(f"Source '{name}' needs 'pattern' for page {url}")
-        href = discover_excel_link(url, pattern, session)
-        file_url = urljoin(url, href)
-
+    file_url = resolve_file_url(name, entry, session)
     logger.info(f"[{name}] Final URL: {file_url}")
-    return download_and_version_file(file_url, save_dir, session)
+    saved = download_and_version_file(file_url, save_dir, session, store=store, segments=segments)
+    with Catalog(project_root) as catalog:
+        catalog.register(saved, name, "raw", content_hash=reference_digest(saved))
+    return saved
 
-def run_all_downloads(config_path: Path = None) -> dict:
+def resolve_config_path(config_path: Path = None) -> tuple:
+    """
+    Return (project_root, config_path), defaulting to config/sources.yml
+    under the project root.
+    """
     if config_path is None:
         project_root = get_project_root()
         config_path = project_root / "config" / "sources.yml"
     else:
         project_root = config_path.parents[1]
+    return project_root, config_path
+
+def run_all_downloads(
+    config_path: Path = None,
+    cache_mode: str = None,
+    cache_ttl: float = None,
+    segments: int = None
+) -> dict:
+    """
+    Download every configured source. cache_mode / cache_ttl override the
+    `http_cache:` section of the config, segments the `segmented:` one.
+    """
+    project_root, config_path = resolve_config_path(config_path)
 
     logger.info(f"Loading config: {config_path}")
     sources = load_sources_config(config_path)
-    session = get_requests_session()
+    cache = load_http_cache(project_root, config_path, cache_mode, cache_ttl)
+    segment_settings = load_segment_settings(config_path, segments, cache)
+    session = get_requests_session(pool_maxsize=max(10, segment_settings["segments"]), cache=cache)
+    store = load_blob_store(project_root, config_path)
     results = {}
     for name, entry in sources.items():
         try:
-            saved = process_source(name, entry, project_root, session)
+            saved = process_source(name, entry, project_root, session, store, segment_settings)
             filename = Path(saved).name
             results[name] = {
                 "status": "successful",
@@ -223,6 +305,18 @@ def main():
     parser = argparse.ArgumentParser(description="Download configured Excel sources")
     parser.add_argument("--config", "-c", help="Path to config YAML (default config/sources.yml)", default=None)
     parser.add_argument("--output-json", "-o", help="Print JSON results", action="store_true")
+    parser.add_argument("--http-cache", choices=CACHE_MODES, default=None,
+                        help="HTTP cache mode (default: http_cache.mode in the config, else off)")
+    parser.add_argument("--cache-ttl", type=float, default=None,
+                        help="Seconds a cached response stays fresh in 'fresh' mode")
+    parser.add_argument("--segments", type=int, default=None,
+                        help="Fetch large workbooks as this many parallel byte ranges (default: segmented.segments "
+                             "in the config; 0 or 1 = single stream)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Run each source's downstream stages as soon as its download finishes")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent downloads in --pipeline mode (default 4)")
+    parser.add_argument("--stage-workers", type=int, default=2,
+                        help="Sources processed downstream at once in --pipeline mode (default 2)")
     parser.add_argument("--verbose", "-v", help="Show detailed progress messages", action="store_true")
     args = parser.parse_args()
 
@@ -233,13 +327,19 @@ def main():
         logging.basicConfig(level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(message)s")
 
     config_path = Path(args.config) if args.config else None
-    results = run_all_downloads(config_path)
+    if args.pipeline:
+        from .pipeline import run_pipeline
+        results = run_pipeline(config_path, args.workers, args.stage_workers, args.http_cache, args.cache_ttl,
+                               args.segments)
+    else:
+        results = run_all_downloads(config_path, args.http_cache, args.cache_ttl, args.segments)
     if args.output_json:
         print(json.dumps(results, indent=2))
     else:
         for name, res in results.items():
             if res["status"] == "successful":
-                print(f"✓ {name}: {res['path']}")
+                downstream = f" (downstream {res['downstream']})" if "downstream" in res else ""
+                print(f"✓ {name}: {res['path']}{downstream}")
             else:
                 print(f"✗ {name}: {res['path']}")
 
@@ -0,0 +1,154 @@
+import hashlib
+import io
+import json
+import logging
+import time
+from pathlib import Path
+
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+logger = logging.getLogger(__name__)
+
+# off: always use the network, never touch the cache
+# record: always use the network and save every successful response
+# replay: serve only from the cache; a missing entry is an error, never a request
+# fresh: serve from the cache when the entry is younger than ttl, else fetch and record
+CACHE_MODES = ("off", "record", "replay", "fresh")
+
+# Defaults for the optional top-level `http_cache:` section of sources.yml
+DEFAULT_CACHE_SETTINGS = {
+    "mode": "off",
+    "ttl": 24 * 3600,
+    "dir": "data/http_cache",
+}
+
+# Headers describing the wire encoding; cached bodies are stored decoded
+WIRE_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+class HttpCache:
+    """
+    On-disk store of recorded HTTP responses, keyed by method and URL.
+    Each entry is <key>.json (url, status, reason, headers, recorded_at)
+    plus <key>.body with the decoded response body.
+    """
+
+    def __init__(self, root: Path, mode: str = "off", ttl: float = DEFAULT_CACHE_SETTINGS["ttl"]):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown HTTP cache mode {mode!r} (expected one of {', '.join(CACHE_MODES)})")
+        self.root = Path(root)
+        self.mode = mode
+        self.ttl = float(ttl)
+
+    def key(self, method: str, url: str) -> str:
+        return hashlib.sha256(f"{method.upper()} {url}".encode("utf-8")).hexdigest()
+
+    def paths(self, method: str, url: str) -> tuple:
+        key = self.key(method, url)
+        base = self.root / key[:2]
+        return base / f"{key}.json", base / f"{key}.body"
+
+    def load(self, method: str, url: str):
+        """Return (meta, body) for a recorded response, or None"""
+        meta_path, body_path = self.paths(method, url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return meta, body_path.read_bytes()
+
+    def save(self, method: str, url: str, response: requests.Response):
+        meta_path, body_path = self.paths(method, url)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "method": method.upper(),
+            "url": url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in WIRE_HEADERS},
+            "recorded_at": time.time(),
+        }
+        # Body first, so a reader never sees metadata without its body
+        tmp = body_path.with_name(body_path.name + ".tmp")
+        tmp.write_bytes(response.content)
+        tmp.replace(body_path)
+        tmp = meta_path.with_name(meta_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        tmp.replace(meta_path)
+        logger.info(f"Recorded response for {url}")
+
+    def is_fresh(self, meta: dict) -> bool:
+        return time.time() - meta.get("recorded_at", 0) < self.ttl
+
+class CachingAdapter(HTTPAdapter):
+    """
+    Transport adapter that records responses to, and replays them from, an
+    HttpCache. Mounted by get_requests_session, so discovery pages and
+    workbook downloads go through it without changes to the callers.
+    """
+
+    def __init__(self, cache: HttpCache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def replay(self, request, meta: dict, body: bytes) -> requests.Response:
+        headers = dict(meta["headers"])
+        headers["Content-Length"] = str(len(body))
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=meta["status"],
+            reason=meta.get("reason"),
+            preload_content=False,
+            decode_content=False,
+        )
+        response = self.build_response(request, raw)
+        response.headers["X-Cache"] = "HIT"
+        return response
+
+    def send(self, request, **kwargs):
+        mode = self.cache.mode
+        if mode in ("replay", "fresh"):
+            cached = self.cache.load(request.method, request.url)
+            if cached is not None and (mode == "replay" or self.cache.is_fresh(cached[0])):
+                logger.info(f"HTTP cache hit: {request.url}")
+                return self.replay(request, *cached)
+            if mode == "replay":
+                raise requests.ConnectionError(
+                    f"No recorded response for {request.method} {request.url} (HTTP cache in replay mode)",
+                    request=request,
+                )
+
+        response = super().send(request, **kwargs)
+        if mode in ("record", "fresh") and response.status_code == 200:
+            self.cache.save(request.method, request.url, response)
+        return response
+
+def load_http_cache(
+    project_root: Path,
+    config_path: Path = None,
+    mode: str = None,
+    ttl: float = None
+) -> HttpCache:
+    """
+    HTTP cache configured by the optional `http_cache:` section of
+    sources.yml; mode and ttl, when given (e.g. from the command line),
+    override the file.
+    """
+    settings = dict(DEFAULT_CACHE_SETTINGS)
+    if config_path is not None and Path(config_path).exists():
+        with open(config_path, "r", encoding="utf-8") as f:
+            settings.update((yaml.safe_load(f) or {}).get("http_cache") or {})
+    if mode is not None:
+        settings["mode"] = mode
+    if ttl is not None:
+        settings["ttl"] = ttl
+    root = Path(settings["dir"])
+    if not root.is_absolute():
+        root = Path(project_root) / root
+    # YAML reads an unquoted `mode: off` as False
+    mode = "off" if settings["mode"] is False else str(settings["mode"])
+    return HttpCache(root, mode=mode, ttl=settings["ttl"])
@@ -0,0 +1,102 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .blob_store import load_blob_store
+from .download_manager import (
+    get_requests_session,
+    load_sources_config,
+    process_source,
+    resolve_config_path,
+)
+from .http_cache import load_http_cache
+from .segmented import load_segment_settings
+from .stages import run_downstream
+
+logger = logging.getLogger(__name__)
+
+def run_pipeline(
+    config_path: Path = None,
+    download_workers: int = 4,
+    stage_workers: int = 2,
+    cache_mode: str = None,
+    cache_ttl: float = None,
+    segments: int = None
+) -> dict:
+    """
+    Download every source and run its downstream stages as a
+    producer/consumer pipeline: a pool of download workers puts each
+    source on a queue as soon as its file is saved, and stage workers take
+    it immediately to run that source's `downstream` chain (parse, metrics,
+    transform, load). Downloads and parsing overlap, and a slow source only
+    delays its own datasets.
+    Returns per-source results like run_all_downloads, plus the downstream
+    status and timings (seconds since the start of the run).
+    """
+    project_root, config_path = resolve_config_path(config_path)
+    logger.info(f"Loading config: {config_path}")
+    sources = load_sources_config(config_path)
+    cache = load_http_cache(project_root, config_path, cache_mode, cache_ttl)
+    segment_settings = load_segment_settings(config_path, segments, cache)
+    # Each download may hold one connection per segment
+    pool_size = max(download_workers, 1) * max(segment_settings["segments"], 1)
+    session = get_requests_session(pool_maxsize=pool_size, cache=cache)
+    store = load_blob_store(project_root, config_path)
+
+    results = {}
+    lock = threading.Lock()
+    ready = queue.Queue()
+    start = time.perf_counter()
+
+    def download(name: str, entry: dict):
+        try:
+            saved = process_source(name, entry, project_root, session, store, segment_settings)
+        except Exception as e:
+            logger.error(f"[{name}] Error: {e}")
+            with lock:
+                results[name] = {
+                    "status": "failed",
+                    "path": f"Download failed: {str(e)}",
+                    "downstream": "skipped",
+                    "downloaded_s": round(time.perf_counter() - start, 3),
+                }
+            return
+        logger.info(f"[{name}] Download succeeded: {saved}")
+        with lock:
+            results[name] = {
+                "status": "successful",
+                "path": f"File {Path(saved).name} successfully saved",
+                "downloaded_s": round(time.perf_counter() - start, 3),
+            }
+        ready.put((name, entry))
+
+    def run_stages():
+        while True:
+            item = ready.get()
+            if item is None:
+                return
+            name, entry = item
+            ok = run_downstream(name, entry, project_root)
+            with lock:
+                results[name]["downstream"] = "successful" if ok else "failed"
+                results[name]["published_s"] = round(time.perf_counter() - start, 3)
+
+    consumers = [threading.Thread(target=run_stages, name=f"stages-{i}") for i in range(max(stage_workers, 1))]
+    for consumer in consumers:
+        consumer.start()
+    try:
+        with ThreadPoolExecutor(max_workers=max(download_workers, 1), thread_name_prefix="download") as pool:
+            for name, entry in sources.items():
+                pool.submit(download, name, entry)
+    finally:
+        # Every download has finished (or failed); let the stage workers drain the queue
+        for _ in consumers:
+            ready.put(None)
+        for consumer in consumers:
+            consumer.join()
+        session.close()
+    # Report in config order rather than completion order
+    return {name: results[name] for name in sources if name in results}
@@ -0,0 +1,139 @@
+import base64
+import hashlib
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+import yaml
+
+from .http_cache import HttpCache
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the optional top-level `segmented:` section of sources.yml
+DEFAULT_SEGMENT_SETTINGS = {
+    "segments": 0,            # parallel byte ranges per workbook (0 or 1 = single stream)
+    "min_size": 1024 * 1024,  # smaller files are always fetched in one request
+}
+
+# Ranges must address the bytes as stored, not a compressed transfer of them
+IDENTITY = {"Accept-Encoding": "identity"}
+
+class SegmentError(Exception):
+    """A segmented download could not be completed or did not verify"""
+
+def load_segment_settings(config_path: Path = None, segments: int = None, cache: HttpCache = None) -> dict:
+    """
+    Segmented download settings from the optional `segmented:` section of
+    sources.yml; segments, when given (e.g. from the command line),
+    overrides the file. Disabled while an HTTP cache is active, since the
+    cache records and replays whole responses only.
+    """
+    settings = dict(DEFAULT_SEGMENT_SETTINGS)
+    if config_path is not None and Path(config_path).exists():
+        with open(config_path, "r", encoding="utf-8") as f:
+            settings.update((yaml.safe_load(f) or {}).get("segmented") or {})
+    if segments is not None:
+        settings["segments"] = segments
+    settings["segments"] = int(settings["segments"] or 0)
+    if settings["segments"] > 1 and cache is not None and cache.mode != "off":
+        logger.info(f"Segmented downloads disabled while the HTTP cache is in {cache.mode} mode")
+        settings["segments"] = 0
+    return settings
+
+def plan_ranges(length: int, segments: int) -> list:
+    """Split [0, length) into at most `segments` contiguous inclusive (start, end) ranges"""
+    segments = max(min(segments, length), 1)
+    size, extra = divmod(length, segments)
+    ranges, start = [], 0
+    for i in range(segments):
+        end = start + size + (1 if i < extra else 0) - 1
+        ranges.append((start, end))
+        start = end + 1
+    return ranges
+
+def expected_digest(headers) -> bytes:
+    """sha-256 announced in a Repr-Digest (RFC 9530) or Digest (RFC 3230) header, or None"""
+    match = re.search(r"sha-256=:([A-Za-z0-9+/=]+):", headers.get("Repr-Digest", ""))
+    if match is None:
+        match = re.search(r"SHA-256=([A-Za-z0-9+/=]+)", headers.get("Digest", ""), re.IGNORECASE)
+    return base64.b64decode(match.group(1)) if match else None
+
+def probe(file_url: str, session: requests.Session):
+    """
+    HEAD the file and return (length, validator, digest) when the server
+    accepts byte ranges and reports a length, else None.
+    validator is the ETag (or Last-Modified) sent back as If-Range, so a
+    file replaced mid-download is detected instead of spliced.
+    """
+    try:
+        resp = session.head(file_url, headers=IDENTITY, allow_redirects=True)
+    except requests.RequestException as e:
+        logger.info(f"HEAD {file_url} failed ({e}), using a single stream")
+        return None
+    if resp.status_code != 200:
+        return None
+    if resp.headers.get("Accept-Ranges", "").lower() != "bytes":
+        logger.info(f"Server does not accept byte ranges for {file_url}, using a single stream")
+        return None
+    length = resp.headers.get("Content-Length")
+    if not length or not length.isdigit() or resp.headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    validator = resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+    return int(length), validator, expected_digest(resp.headers)
+
+def fetch_range(file_url: str, session: requests.Session, start: int, end: int, length: int, validator: str) -> bytes:
+    headers = {**IDENTITY, "Range": f"bytes={start}-{end}"}
+    if validator:
+        headers["If-Range"] = validator
+    try:
+        resp = session.get(file_url, headers=headers)
+    except requests.RequestException as e:
+        raise SegmentError(f"bytes {start}-{end}: {e}") from e
+    if resp.status_code == 200:
+        # If-Range did not match (or the range was ignored): the file changed
+        raise SegmentError(f"bytes {start}-{end}: server sent the whole file, it may have changed")
+    if resp.status_code != 206:
+        raise SegmentError(f"bytes {start}-{end}: HTTP {resp.status_code}")
+    if resp.headers.get("Content-Range") != f"bytes {start}-{end}/{length}":
+        raise SegmentError(f"bytes {start}-{end}: unexpected Content-Range {resp.headers.get('Content-Range')!r}")
+    if len(resp.content) != end - start + 1:
+        raise SegmentError(f"bytes {start}-{end}: got {len(resp.content)} bytes")
+    return resp.content
+
+def segmented_get(file_url: str, session: requests.Session, segments: int, min_size: int = 0) -> bytes:
+    """
+    Download file_url as `segments` byte ranges fetched in parallel over
+    the session's connection pool. Every range must come back as a 206
+    with exactly its bytes of the probed length, and the assembled file
+    must match the server's sha-256 when one is announced.
+    Returns None when the server does not support ranges or the file is
+    smaller than min_size (the caller then uses a single GET); raises
+    SegmentError when a range fails or the result does not verify.
+    """
+    probed = probe(file_url, session)
+    if probed is None:
+        return None
+    length, validator, digest = probed
+    if length < max(min_size, 1):
+        return None
+
+    ranges = plan_ranges(length, segments)
+    logger.info(f"Downloading {length} bytes in {len(ranges)} segments: {file_url}")
+    content = bytearray(length)
+    with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="segment") as pool:
+        futures = {
+            pool.submit(fetch_range, file_url, session, start, end, length, validator): start
+            for start, end in ranges
+        }
+        for future, start in futures.items():
+            chunk = future.result()
+            content[start:start + len(chunk)] = chunk
+
+    sha256 = hashlib.sha256(content)
+    if digest is not None and sha256.digest() != digest:
+        raise SegmentError("sha-256 of the assembled file does not match the server's digest")
+    logger.info(f"Verified {length} bytes (sha256 {sha256.hexdigest()[:12]})")
+    return bytes(content)
@@ -0,0 +1,35 @@
+import logging
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+def run_downstream(name: str, entry: dict, project_root: Path) -> bool:
+    """
+    Run the downstream stages configured for a source, in order.
+    Each stage is a module path (e.g. src.parse.importation_countries.parser),
+    optionally followed by arguments, executed with `python -m` from the
+    project root, the same way the stages are run by hand. Stops at the
+    first failing stage.
+    Returns True when every stage succeeded (or none are configured).
+    """
+    stages = entry.get("downstream") or []
+    if not stages:
+        logger.info(f"[{name}] No downstream stages configured")
+        return True
+
+    for module in stages:
+        logger.info(f"[{name}] Running stage: {module}")
+        proc = subprocess.run(
+            [sys.executable, "-m", *shlex.split(module)],
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            logger.error(f"[{name}] Stage {module} failed (exit {proc.returncode}): {proc.stderr.strip()}")
+            return False
+        logger.info(f"[{name}] Stage {module} done")
+    return True
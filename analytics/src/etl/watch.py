@@ -0,0 +1,199 @@
+import hashlib
+import heapq
+import json
+import logging
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+
+import requests
+import yaml
+
+from .blob_store import BlobStore, load_blob_store
+from .catalog import Catalog
+from .http_cache import CACHE_MODES, load_http_cache
+from .download_manager import (
+    get_requests_session,
+    load_sources_config,
+    resolve_config_path,
+    resolve_file_url,
+    save_versioned_content,
+)
+from .stages import run_downstream
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the optional top-level `watch:` section of sources.yml (seconds)
+DEFAULT_WATCH_SETTINGS = {
+    "poll_interval": 6 * 3600,
+    "backoff_base": 60,
+    "backoff_max": 6 * 3600,
+}
+
+def load_watch_settings(config_path: Path) -> dict:
+    with open(config_path, "r", encoding="utf-8") as f:
+        cfg_all = yaml.safe_load(f) or {}
+    settings = dict(DEFAULT_WATCH_SETTINGS)
+    settings.update(cfg_all.get("watch") or {})
+    return settings
+
+def backoff_delay(failures: int, base: float, maximum: float) -> float:
+    """
+    Exponential backoff with jitter: base * 2**(failures - 1), capped at
+    maximum, then scaled by a random factor in [0.5, 1.5) so sources that
+    failed together do not retry in lockstep.
+    """
+    delay = min(base * (2 ** max(failures - 1, 0)), maximum)
+    return delay * random.uniform(0.5, 1.5)
+
+def load_state(state_path: Path) -> dict:
+    if not state_path.exists():
+        return {}
+    with open(state_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_state(state_path: Path, state: dict):
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = state_path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    tmp.replace(state_path)
+
+def poll_source(
+    name: str,
+    entry: dict,
+    project_root: Path,
+    session: requests.Session,
+    previous: dict,
+    store: BlobStore = None
+) -> dict:
+    """
+    Check one source for a new release.
+    Sends a conditional GET (ETag / Last-Modified from the previous poll)
+    and compares the content hash with the last seen file, so an unchanged
+    workbook is neither rewritten nor passed downstream.
+    Returns the new state for the source; its "changed" key tells whether
+    a new or changed file was saved.
+    """
+    local_subdir = entry.get("local_subdir")
+    if not local_subdir:
+        raise ValueError(f"Source '{name}' missing 'local_subdir'")
+
+    file_url = resolve_file_url(name, entry, session)
+    headers = {}
+    if previous.get("file_url") == file_url:
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+    resp = session.get(file_url, headers=headers)
+    checked_at = datetime.now().isoformat(timespec="seconds")
+    if resp.status_code == 304:
+        logger.info(f"[{name}] Not modified: {file_url}")
+        return {**previous, "checked_at": checked_at, "changed": False}
+    resp.raise_for_status()
+
+    state = {
+        "file_url": file_url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "sha256": hashlib.sha256(resp.content).hexdigest(),
+        "path": previous.get("path"),
+        "checked_at": checked_at,
+    }
+    if state["sha256"] == previous.get("sha256"):
+        logger.info(f"[{name}] Content unchanged: {file_url}")
+        return {**state, "changed": False}
+
+    saved = save_versioned_content(file_url, resp.content, project_root / local_subdir, store=store)
+    with Catalog(project_root) as catalog:
+        catalog.register(saved, name, "raw", content_hash=state["sha256"])
+    logger.info(f"[{name}] New release detected: {saved}")
+    return {**state, "path": str(saved), "changed": True}
+
+def watch_sources(
+    config_path: Path = None,
+    once: bool = False,
+    downstream: bool = True,
+    cache_mode: str = None,
+    cache_ttl: float = None
+) -> dict:
+    """
+    Poll every configured source on its own schedule and trigger the
+    downstream stages for a source only when its file actually changed.
+    Each source's interval is its `poll_interval` (falling back to the
+    `watch:` section defaults); failures are retried with jittered
+    exponential backoff. One session, and its connection pool, is shared
+    by every poll. With once=True each source is polled a single time.
+    cache_mode / cache_ttl override the `http_cache:` section of the config.
+    Returns the last state of every source.
+    """
+    project_root, config_path = resolve_config_path(config_path)
+    logger.info(f"Loading config: {config_path}")
+    sources = load_sources_config(config_path)
+    settings = load_watch_settings(config_path)
+    cache = load_http_cache(project_root, config_path, cache_mode, cache_ttl)
+    session = get_requests_session(pool_maxsize=max(len(sources), 1), cache=cache)
+    store = load_blob_store(project_root, config_path)
+
+    state_path = project_root / "data" / "state" / "watch.json"
+    state = load_state(state_path)
+    failures = {name: 0 for name in sources}
+
+    schedule = [(time.monotonic(), name) for name in sources]
+    heapq.heapify(schedule)
+    while schedule:
+        due, name = heapq.heappop(schedule)
+        wait = due - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+        entry = sources[name]
+        interval = float(entry.get("poll_interval", settings["poll_interval"]))
+        try:
+            result = poll_source(name, entry, project_root, session, state.get(name, {}), store)
+            if result.pop("changed") and downstream:
+                if not run_downstream(name, entry, project_root):
+                    # Keep the previous hash so the release is picked up again
+                    raise RuntimeError("downstream stages failed")
+            state[name] = result
+            save_state(state_path, state)
+            failures[name] = 0
+            delay = interval
+        except Exception as e:
+            failures[name] += 1
+            delay = backoff_delay(failures[name], settings["backoff_base"], settings["backoff_max"])
+            logger.error(f"[{name}] Error: {e} (attempt {failures[name]}, retrying in {delay:.0f}s)")
+
+        if not once:
+            heapq.heappush(schedule, (time.monotonic() + delay, name))
+            logger.info(f"[{name}] Next poll in {delay:.0f}s")
+    return state
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Watch configured sources and process new releases")
+    parser.add_argument("--config", "-c", help="Path to config YAML (default config/sources.yml)", default=None)
+    parser.add_argument("--once", help="Poll every source once and exit", action="store_true")
+    parser.add_argument("--no-downstream", help="Only download; do not run parse/transform stages", action="store_true")
+    parser.add_argument("--http-cache", choices=CACHE_MODES, default=None,
+                        help="HTTP cache mode (default: http_cache.mode in the config, else off)")
+    parser.add_argument("--cache-ttl", type=float, default=None,
+                        help="Seconds a cached response stays fresh in 'fresh' mode")
+    parser.add_argument("--verbose", "-v", help="Show detailed progress messages", action="store_true")
+    args = parser.parse_args()
+
+    level = logging.INFO if args.verbose else logging.WARNING
+    logging.basicConfig(level=level, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    config_path = Path(args.config) if args.config else None
+    try:
+        watch_sources(config_path, once=args.once, downstream=not args.no_downstream,
+                      cache_mode=args.http_cache, cache_ttl=args.cache_ttl)
+    except KeyboardInterrupt:
+        print("Watch stopped")
+
+if __name__ == "__main__":
+    main()
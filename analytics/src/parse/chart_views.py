@@ -0,0 +1,250 @@
+import hashlib
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Month names used as keys in the *-monthly-transformed.json files
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+MONTH_LABELS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+GRANULARITIES = ("monthly", "quarterly", "yearly")
+
+# Values are written with a fixed number of decimals, so float noise from the
+# aggregation never shows up as a change in the website data
+VALUE_DECIMALS = 2
+
+def stable_color(label: str) -> str:
+    """Hex color derived from the label, identical on every run"""
+    return "#" + hashlib.sha256(str(label).encode("utf-8")).hexdigest()[:6]
+
+def chart_options(title: str, x_title: str) -> dict:
+    """Chart.js options shared by the import charts"""
+    return {
+        "responsive": True,
+        "plugins": {
+            "title": {
+                "display": True,
+                "text": title
+            },
+            "legend": {
+                "position": "top"
+            },
+            "tooltip": {
+                "callbacks": {
+                    "label": "function(context) { const value = context.raw.toLocaleString('en-US', { maximumFractionDigits: 0 }); return `${context.dataset.label}: ${value} M BIF`; }"
+                }
+            }
+        },
+        "scales": {
+            "x": {
+                "stacked": True,
+                "title": {
+                    "display": True,
+                    "text": x_title
+                }
+            },
+            "y": {
+                "stacked": True,
+                "title": {
+                    "display": True,
+                    "text": "Import Value (Million BIF)"
+                }
+            }
+        }
+    }
+
+def build_period_matrix(source_data: dict, groups: list) -> tuple:
+    """
+    Aggregate {year: {month name: {group: value}}} into one array of shape
+    (groups, years, 12), in a single pass over the source data.
+    Returns (years, matrix); missing months are 0.
+    """
+    years = sorted(source_data.keys())
+    group_index = {group: i for i, group in enumerate(groups)}
+    month_index = {month: i for i, month in enumerate(MONTHS)}
+    matrix = np.zeros((len(groups), len(years), 12))
+    for y, year in enumerate(years):
+        for month, values in source_data[year].items():
+            m = month_index[month]
+            for group, value in values.items():
+                if group in group_index:
+                    matrix[group_index[group], y, m] += value or 0
+    return years, matrix
+
+def build_views(source_data: dict, groups: list, colors: dict, title: str, description: str) -> dict:
+    """
+    Build the monthly, quarterly and yearly chart payloads from one
+    aggregation pass. The monthly view keeps the per-year layout the
+    website already uses; quarterly and yearly views are single series
+    covering every year, so a multi-year trend needs no client-side sums.
+    title and description contain a "{granularity}" placeholder
+    ("Monthly", "Quarterly", "Yearly").
+    """
+    years, matrix = build_period_matrix(source_data, groups)
+    quarterly = matrix.reshape(len(groups), len(years), 4, 3).sum(axis=3)
+    yearly = matrix.sum(axis=2)
+
+    def datasets(values):
+        return [
+            {
+                "label": group,
+                "data": np.round(values[g], VALUE_DECIMALS).tolist(),
+                "backgroundColor": colors[group]
+            }
+            for g, group in enumerate(groups)
+        ]
+
+    def base(granularity, x_title):
+        name = granularity.capitalize()
+        return {
+            "type": "bar",
+            "granularity": granularity,
+            "title": title.format(granularity=name),
+            "description": description.format(granularity=name),
+            "years": years,
+            "options": chart_options(title.format(granularity=name), x_title),
+        }
+
+    monthly_view = base("monthly", "Month")
+    monthly_view["data"] = {
+        year: {"labels": MONTH_LABELS, "datasets": datasets(matrix[:, y, :])}
+        for y, year in enumerate(years)
+    }
+
+    quarterly_view = base("quarterly", "Quarter")
+    quarterly_view["labels"] = [f"{year} Q{q}" for year in years for q in range(1, 5)]
+    quarterly_view["datasets"] = datasets(quarterly.reshape(len(groups), -1))
+
+    yearly_view = base("yearly", "Year")
+    yearly_view["labels"] = years
+    yearly_view["datasets"] = datasets(yearly)
+
+    return {"monthly": monthly_view, "quarterly": quarterly_view, "yearly": yearly_view}
+
+def shard_id(label: str) -> str:
+    """File-name-safe id for a group label ("Amérique du Sud" -> "amerique-du-sud")"""
+    text = unicodedata.normalize("NFKD", str(label)).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "other"
+
+def build_drilldown(parsed: pd.DataFrame, group_column: str, key_column: str, title: str) -> dict:
+    """
+    Item-level drilldown data from a parsed monthly frame (one row per item,
+    one YYYY-MM column per month), sharded by group so the page fetches
+    only the group of the item the user picks.
+    Returns {"index": ..., "shards": {shard id: shard}}. The index lists
+    every item with its group (under group_column), total over all months
+    and shard id; each shard maps its items to their monthly values,
+    aligned with index["periods"].
+    """
+    periods = sorted(c for c in parsed.columns if re.fullmatch(r"\d{4}-\d{2}", str(c)))
+    frame = parsed.sort_values([group_column, key_column], kind="stable")
+    values = np.round(frame[periods].to_numpy(dtype=float), VALUE_DECIMALS)
+    totals = np.round(values.sum(axis=1), VALUE_DECIMALS)
+
+    items, shards = [], {}
+    for (key, group), row, total in zip(frame[[key_column, group_column]].itertuples(index=False), values, totals):
+        sid = shard_id(group)
+        items.append({"name": key, group_column: group, "total": float(total), "shard": sid})
+        shards.setdefault(sid, {group_column: group, "series": {}})["series"][key] = row.tolist()
+
+    options = chart_options(title, "Month")
+    options["scales"]["x"]["stacked"] = False
+    options["scales"]["y"]["stacked"] = False
+    index = {
+        "type": "line",
+        "title": title,
+        "group_field": group_column,
+        "periods": periods,
+        "items": items,
+        "options": options,
+    }
+    return {"index": index, "shards": shards}
+
+def write_if_changed(path, payload) -> str:
+    """
+    Write payload as JSON unless the file already has exactly that content.
+    Returns "added", "updated" or "unchanged".
+    """
+    path = Path(path)
+    text = json.dumps(payload, indent=2)
+    if path.exists():
+        if path.read_text(encoding="utf-8") == text:
+            return "unchanged"
+        status = "updated"
+    else:
+        status = "added"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+    return status
+
+def write_views(views: dict, output_dir, name: str) -> dict:
+    """
+    Write each view to <output_dir>/<granularity>_<name>.json, rewriting
+    only files whose content changed. The monthly view is split into an
+    index (everything but the data, plus a "shards" map) and one shard per
+    year under monthly_<name>/<year>.json, so a revision of one year only
+    rewrites that year. Shards of years no longer present are removed.
+    Returns {path: "added" | "updated" | "unchanged" | "removed"}.
+    """
+    output_dir = Path(output_dir)
+    changes = {}
+    for granularity, view in views.items():
+        if granularity == "monthly" and "data" in view:
+            shard_dir = output_dir / f"monthly_{name}"
+            index = {key: value for key, value in view.items() if key != "data"}
+            index["shards"] = {}
+            for year, year_data in view["data"].items():
+                shard_path = shard_dir / f"{year}.json"
+                index["shards"][year] = shard_path.relative_to(output_dir).as_posix()
+                changes[str(shard_path)] = write_if_changed(shard_path, year_data)
+            if shard_dir.exists():
+                for stale in sorted(shard_dir.glob("*.json")):
+                    if stale.stem not in view["data"]:
+                        stale.unlink()
+                        changes[str(stale)] = "removed"
+            view = index
+        output_path = output_dir / f"{granularity}_{name}.json"
+        changes[str(output_path)] = write_if_changed(output_path, view)
+    return changes
+
+def write_drilldown(drilldown: dict, output_dir, name: str) -> dict:
+    """
+    Write drilldown_<name>.json (the index, with a "shards" map of shard
+    id -> file) and drilldown_<name>/<shard id>.json, rewriting only changed
+    files and removing shards that no longer exist. Returns the changes as
+    write_views does.
+    """
+    output_dir = Path(output_dir)
+    shard_dir = output_dir / f"drilldown_{name}"
+    index = dict(drilldown["index"])
+    index["shards"] = {}
+    changes = {}
+    for sid, shard in sorted(drilldown["shards"].items()):
+        shard_path = shard_dir / f"{sid}.json"
+        index["shards"][sid] = shard_path.relative_to(output_dir).as_posix()
+        changes[str(shard_path)] = write_if_changed(shard_path, shard)
+    if shard_dir.exists():
+        for stale in sorted(shard_dir.glob("*.json")):
+            if stale.stem not in drilldown["shards"]:
+                stale.unlink()
+                changes[str(stale)] = "removed"
+    index_path = output_dir / f"drilldown_{name}.json"
+    changes[str(index_path)] = write_if_changed(index_path, index)
+    return changes
+
+def change_summary(changes: dict) -> str:
+    """One line of counts per status, followed by the files that changed"""
+    counts = {}
+    for status in changes.values():
+        counts[status] = counts.get(status, 0) + 1
+    lines = [", ".join(f"{count} {status}" for status, count in sorted(counts.items()))]
+    lines += [f"  {status:<9} {path}" for path, status in changes.items() if status != "unchanged"]
+    return "\n".join(lines)
@@ -0,0 +1,523 @@
+import csv
+import importlib.util
+import json
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+from ..etl.blob_store import open_workbook_source, reference_digest, workbook_suffix
+from ..etl.catalog import Catalog, find_latest
+from ..etl.download_manager import get_project_root
+from .validation import validate_sheet
+
+logger = logging.getLogger(__name__)
+
+PARSE_DIR = Path(__file__).parent
+
+def load_datasets_config(config_path: Path = None) -> dict:
+    if config_path is None:
+        config_path = get_project_root() / "config" / "datasets.yml"
+    if not config_path.exists():
+        raise FileNotFoundError(f"Config file not found: {config_path}")
+    with open(config_path, "r", encoding="utf-8") as f:
+        cfg_all = yaml.safe_load(f)
+    if not isinstance(cfg_all, dict) or "datasets" not in cfg_all:
+        raise ValueError(f"Invalid config (missing 'datasets'): {config_path}")
+    return cfg_all["datasets"]
+
+def strip_label(value) -> str:
+    return str(value).strip()
+
+def normalize_code(code) -> str:
+    """Normalize category codes to match our reference format"""
+    if pd.isna(code):
+        return ''
+
+    # Convert to string and strip whitespace
+    code_str = str(code).strip()
+
+    # Handle decimal numbers (like "3,0" -> "3")
+    if ',' in code_str:
+        code_str = code_str.split(',')[0].strip()
+
+    # Filter out metadata rows
+    if code_str.startswith('Source:') or code_str.startswith('('):
+        return ''
+
+    return code_str
+
+KEY_FORMATS = {
+    "strip": strip_label,
+    "code": normalize_code,
+}
+
+QUARTER_PATTERNS = [
+    re.compile(r"(?:T|Q)\s*([1-4])\D*(\d{4})", re.IGNORECASE),
+    re.compile(r"(\d{4})\D*(?:T|Q)\s*([1-4])", re.IGNORECASE),
+]
+
+def format_period(value, granularity: str):
+    """
+    Format a header cell as a period label for the given granularity:
+    YYYY-MM (monthly), YYYY-Qn (quarterly) or YYYY (annual).
+    Returns None when the cell is not a period (label or blank columns).
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+
+    if granularity == "monthly":
+        try:
+            dt = pd.Timestamp(value) if isinstance(value, datetime) else pd.to_datetime(str(value))
+            return dt.strftime('%Y-%m')
+        except (ValueError, TypeError):
+            return None
+
+    if isinstance(value, datetime):
+        if granularity == "quarterly":
+            return f"{value.year}-Q{(value.month - 1) // 3 + 1}"
+        return f"{value.year}"
+
+    text = str(value).strip()
+    if granularity == "quarterly":
+        for i, pattern in enumerate(QUARTER_PATTERNS):
+            match = pattern.search(text)
+            if match:
+                quarter, year = match.groups() if i == 0 else match.groups()[::-1]
+                return f"{year}-Q{quarter}"
+        return None
+
+    match = re.fullmatch(r"(\d{4})(?:\.0)?", text)
+    return match.group(1) if match else None
+
+def period_columns(header_cells, granularity: str) -> dict:
+    """
+    Map header cells to period labels: {column: period}, skipping the first
+    (label) column, non-period cells and repeated periods.
+    header_cells is an iterable of (column, cell) pairs.
+    """
+    periods = {}
+    seen = set()
+    for i, (col, cell) in enumerate(header_cells):
+        if i == 0:
+            continue
+        period = format_period(cell, granularity)
+        if period is not None and period not in seen:
+            periods[col] = period
+            seen.add(period)
+    return periods
+
+def to_float(value) -> float:
+    """Coerce a cell to float the way pd.to_numeric(errors='coerce').fillna(0.0) does"""
+    if isinstance(value, bool) or value is None:
+        return 0.0
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if result != result else result  # NaN -> 0.0
+
+def iter_workbook_sheets(excel_path: Path, sheet_names: list, blob_root: Path = None):
+    """
+    Yield (sheet_name, row iterator) for the requested sheets present in the
+    workbook, opening it once in a streaming mode: openpyxl read-only for
+    .xlsx (rows are read lazily from the zip), xlrd on-demand for .xls
+    (one sheet loaded at a time, released after use).
+    Rows are tuples of cell values; dates come back as datetime.
+    """
+    source = open_workbook_source(excel_path, blob_root) if blob_root else excel_path
+    if workbook_suffix(excel_path) == ".xls":
+        import xlrd
+        if isinstance(source, Path):
+            book = xlrd.open_workbook(source, on_demand=True)
+        else:
+            book = xlrd.open_workbook(file_contents=source.getvalue(), on_demand=True)
+        try:
+            for sheet_name in sheet_names:
+                if sheet_name not in book.sheet_names():
+                    continue
+                sheet = book.sheet_by_name(sheet_name)
+
+                def rows(sheet=sheet):
+                    for cells in sheet.get_rows():
+                        yield tuple(
+                            xlrd.xldate_as_datetime(c.value, book.datemode)
+                            if c.ctype == xlrd.XL_CELL_DATE else c.value
+                            for c in cells
+                        )
+
+                yield sheet_name, rows()
+                book.unload_sheet(sheet_name)
+        finally:
+            book.release_resources()
+        return
+
+    from openpyxl import load_workbook
+    book = load_workbook(source, read_only=True, data_only=True)
+    try:
+        for sheet_name in sheet_names:
+            if sheet_name in book.sheetnames:
+                yield sheet_name, book[sheet_name].iter_rows(values_only=True)
+    finally:
+        book.close()
+
+# pd.read_excel engines by workbook type, fastest first, with the module each needs.
+# calamine (Rust, via the optional python-calamine package) reads both formats.
+READER_ENGINES = {
+    ".xlsx": ["calamine", "openpyxl"],
+    ".xls": ["calamine", "xlrd"],
+}
+ENGINE_MODULES = {
+    "calamine": "python_calamine",
+    "openpyxl": "openpyxl",
+    "xlrd": "xlrd",
+}
+
+def engine_available(engine: str) -> bool:
+    return importlib.util.find_spec(ENGINE_MODULES[engine]) is not None
+
+def select_engine(suffix: str, reader: str = "auto") -> str:
+    """
+    Pick the pd.read_excel engine for a workbook type: the first installed
+    engine of READER_ENGINES with reader="auto", else the named engine,
+    falling back to auto when it is not installed or cannot read the type.
+    """
+    candidates = READER_ENGINES.get(suffix, READER_ENGINES[".xlsx"])
+    if reader != "auto":
+        if reader in candidates and engine_available(reader):
+            return reader
+        logger.warning(f"Reader engine {reader!r} unavailable for {suffix} workbooks, using the default")
+    for engine in candidates:
+        if engine_available(engine):
+            return engine
+    raise ImportError(f"No Excel reader installed for {suffix} workbooks (tried {', '.join(candidates)})")
+
+def load_reference(reference: dict, normalize_key=strip_label) -> dict:
+    """
+    Load a label -> group map from a reference CSV under src/parse/. Keys go
+    through the same normalize_key as the sheet labels they are matched with.
+    """
+    ref = pd.read_csv(PARSE_DIR / reference["file"], dtype=str, keep_default_na=False)
+    return dict(zip(ref[reference["key"]].map(normalize_key), ref[reference["group"]]))
+
+class WorkbookParser:
+    """
+    Config-driven parser for BRB workbooks.
+    A descriptor (see config/datasets.yml) names the sheets to read, the
+    header marker, the label column and the reference map; parse_workbook
+    opens the workbook once and returns one frame per configured sheet.
+    """
+
+    def __init__(self, data_root: Path, name: str, descriptor: dict):
+        self.data_root = Path(data_root)
+        self.name = name
+        self.descriptor = descriptor
+        self.raw_dir = self.data_root / descriptor.get("raw_subdir", f"data/raw/{name}")
+        self.parsed_dir = self.data_root / "data" / "parsed" / name
+        self.parsed_dir.mkdir(parents=True, exist_ok=True)
+        self.blob_root = self.data_root / "data" / "blobs"
+
+        self.key_column = descriptor["key_column"]
+        self.normalize_key = KEY_FORMATS[descriptor.get("key_format", "strip")]
+        reference = descriptor.get("reference")
+        self.reference_map = load_reference(reference, self.normalize_key) if reference else None
+        self.group_column = descriptor.get("group_column")
+        self.columns = descriptor.get("columns") or [
+            c for c in (self.group_column, self.key_column) if c
+        ]
+        self.validation_rules = descriptor.get("validation") or {}
+        # pd.read_excel engine: "auto" (fastest installed) or an engine name
+        self.reader = descriptor.get("reader", "auto")
+        # Validation report of each sheet read by the last parse_workbook call
+        self.reports = {}
+
+    def parse_workbook(self, excel_path: Path) -> dict:
+        """Return {granularity: DataFrame} for every configured sheet in the workbook"""
+        logger.info(f"Processing file: {excel_path}")
+        frames = {}
+        self.reports = {}
+        engine = select_engine(workbook_suffix(excel_path), self.reader)
+        logger.info(f"Reading {Path(excel_path).name} with the {engine} engine")
+        with pd.ExcelFile(open_workbook_source(excel_path, self.blob_root), engine=engine) as workbook:
+            for granularity, sheet in self.descriptor["sheets"].items():
+                if sheet not in workbook.sheet_names:
+                    logger.info(f"Sheet {sheet!r} not in {Path(excel_path).name}, skipping {granularity}")
+                    continue
+                raw = workbook.parse(sheet, header=None)
+                frames[granularity] = self.parse_sheet(raw, granularity)
+        if not frames:
+            raise ValueError(f"None of the configured sheets found in {excel_path}")
+        return frames
+
+    def parse_excel(self, excel_path: Path) -> pd.DataFrame:
+        """Return the monthly frame of a workbook"""
+        return self.parse_workbook(excel_path)["monthly"]
+
+    def find_header_row(self, labels: pd.Series) -> int:
+        marker = self.descriptor["header_marker"]
+        matches = labels.astype(str).str.contains(marker, regex=False, na=False)
+        if not matches.any():
+            raise ValueError(f"Could not find header row with {marker!r}")
+        return int(matches.to_numpy().argmax())
+
+    def parse_sheet(self, raw: pd.DataFrame, granularity: str) -> pd.DataFrame:
+        header_pos = self.find_header_row(raw.iloc[:, 0])
+        header = raw.iloc[header_pos]
+        body = raw.iloc[header_pos + 1:]
+
+        # Map sheet columns to period labels, dropping label and blank columns
+        period_cols = period_columns(header.items(), granularity)
+
+        keys = body.iloc[:, 0].map(self.normalize_key)
+        if self.reference_map is not None:
+            valid = keys.isin(self.reference_map.keys())
+        else:
+            valid = (keys != "") & (keys != "nan")
+
+        # Convert the value block to float; non-numeric and empty values become 0.0 in the
+        # output, but stay NaN in `numeric` so validation can count them
+        block = body[list(period_cols)]
+        block.columns = list(period_cols.values())
+        numeric = block.apply(pd.to_numeric, errors='coerce')
+        values = numeric[valid].fillna(0.0)
+
+        # Validation runs on the arrays built above, in the same pass
+        groups = keys.map(self.reference_map) if self.reference_map is not None else None
+        report = validate_sheet(keys, valid, block, numeric, groups, self.validation_rules)
+        self.reports[granularity] = report
+        if report["unmatched_labels"]:
+            # Total, subtotal and note rows are expected and not listed
+            logger.warning(
+                f"Unmatched {self.key_column} values: {', '.join(report['unmatched_labels'])} "
+                f"({report['unreferenced']['share']:.2%} of the total)"
+            )
+        if report["status"] != "ok":
+            logger.warning(
+                f"Validation {report['status']} for {self.name} {granularity}: "
+                f"{report['coerced_cells']['count']} coerced cells, "
+                f"{report['negative_values']['count']} negative values, "
+                f"{report['outliers']['count']} outliers"
+            )
+
+        df = values[sorted(values.columns)].copy()
+        df.insert(0, self.key_column, keys[valid])
+        if self.reference_map is not None and self.group_column:
+            df.insert(0, self.group_column, df[self.key_column].map(self.reference_map))
+        leading = [c for c in self.columns if c in df.columns]
+        return df[leading + sorted(values.columns)].reset_index(drop=True)
+
+    def stream_workbook(self, excel_path: Path, chunk_size: int = 50000) -> dict:
+        """
+        Streaming alternative to parse_workbook for very large workbooks.
+        Rows are read one at a time, filtered against the reference map as
+        they arrive and written in long format ({group, key, period, value})
+        to <date>-<granularity>-long.csv, flushing every chunk_size records,
+        so peak memory depends on chunk_size rather than on the sheet size.
+        Returns {granularity: output path}.
+        """
+        logger.info(f"Streaming file: {excel_path}")
+        sheets = self.descriptor["sheets"]
+        granularity_of = {sheet: granularity for granularity, sheet in sheets.items()}
+        today = datetime.now().strftime("%Y-%m-%d")
+        outputs = {}
+        for sheet_name, rows in iter_workbook_sheets(excel_path, list(sheets.values()), self.blob_root):
+            granularity = granularity_of[sheet_name]
+            output_file = self.parsed_dir / f"{today}-{granularity}-long.csv"
+            written = self.stream_sheet(rows, granularity, output_file, chunk_size)
+            logger.info(f"Saved {written} {granularity} records to: {output_file}")
+            outputs[granularity] = output_file
+        if not outputs:
+            raise ValueError(f"None of the configured sheets found in {excel_path}")
+        return outputs
+
+    def stream_sheet(self, rows, granularity: str, output_file: Path, chunk_size: int) -> int:
+        marker = self.descriptor["header_marker"]
+        for header in rows:
+            if header and marker in str(header[0]):
+                break
+        else:
+            raise ValueError(f"Could not find header row with {marker!r}")
+        period_cols = period_columns(enumerate(header), granularity)
+
+        with_group = self.reference_map is not None and self.group_column
+        fields = ([self.group_column] if with_group else []) + [self.key_column, "period", "value"]
+        unmatched = set()
+        written = 0
+        buffer = []
+        with open(output_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            for row in rows:
+                if not row:
+                    continue
+                key = self.normalize_key(row[0])
+                if self.reference_map is not None:
+                    if key not in self.reference_map:
+                        if key not in ("", "None"):
+                            unmatched.add(key)
+                        continue
+                elif key in ("", "None", "nan"):
+                    continue
+                lead = (self.reference_map[key], key) if with_group else (key,)
+                for pos, period in period_cols.items():
+                    value = to_float(row[pos]) if pos < len(row) else 0.0
+                    buffer.append(lead + (period, value))
+                if len(buffer) >= chunk_size:
+                    writer.writerows(buffer)
+                    written += len(buffer)
+                    buffer.clear()
+            writer.writerows(buffer)
+            written += len(buffer)
+        if unmatched:
+            logger.warning(f"Unmatched {self.key_column} values: {', '.join(sorted(unmatched))}")
+        return written
+
+    def save_report(self, report: dict, granularity: str, source: Path) -> Path:
+        today = datetime.now().strftime("%Y-%m-%d")
+        output_file = self.parsed_dir / f"{today}-{granularity}-validation.json"
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump({"dataset": self.name, "granularity": granularity, "source": str(source), **report},
+                      f, indent=2, ensure_ascii=False)
+        logger.info(f"Saved validation report to: {output_file}")
+        return output_file
+
+    def save_csv(self, df: pd.DataFrame, granularity: str = "monthly") -> Path:
+        # Generate output filename with today's date
+        today = datetime.now().strftime("%Y-%m-%d")
+        output_file = self.parsed_dir / f"{today}-{granularity}.csv"
+
+        # Save to CSV
+        df.to_csv(output_file, index=False)
+        logger.info(f"Saved parsed data to: {output_file}")
+        return output_file
+
+def get_parser(name: str, data_root: Path = None, config_path: Path = None) -> WorkbookParser:
+    datasets = load_datasets_config(config_path)
+    if name not in datasets:
+        raise ValueError(f"Unknown dataset {name!r} (not in datasets config)")
+    return WorkbookParser(data_root or get_project_root(), name, datasets[name])
+
+def parse_dataset(
+    parser: WorkbookParser,
+    excel_files: list = None,
+    stream: bool = False,
+    chunk_size: int = 50000,
+    force: bool = False,
+    strict: bool = None
+) -> list:
+    """
+    Parse workbooks of a dataset (default: its latest raw download from the
+    catalog) and save one CSV per sheet, cataloged with the workbook as
+    upstream. With stream=True the bounded-memory long-format mode is used
+    instead. A workbook whose content hash was already parsed is skipped
+    unless force is set. A validation report is saved next to each parsed
+    sheet; in strict mode (default: the descriptor's validation.strict) a
+    workbook with a failing report is not saved and ValueError is raised.
+    Streaming mode does not validate, so it raises ValueError in strict mode.
+    Returns the saved paths.
+    """
+    if strict is None:
+        strict = bool(parser.validation_rules.get("strict", False))
+    if stream and strict:
+        # Streaming mode writes rows as they are read and never validates the sheet
+        raise ValueError(f"{parser.name} is validated in strict mode, which streaming mode cannot do; "
+                         f"parse without --stream, or pass --no-strict to stream without validation")
+    failed = []
+    if excel_files is None:
+        if not parser.raw_dir.exists():
+            logger.warning(f"Directory not found: {parser.raw_dir}")
+            return []
+        try:
+            latest, _ = find_latest(parser.data_root, parser.name, "raw", parser.raw_dir, "*.xls*")
+        except FileNotFoundError:
+            logger.warning(f"No Excel files found in {parser.raw_dir}")
+            return []
+        excel_files = [latest]
+
+    saved = []
+    with Catalog(parser.data_root) as catalog:
+        for excel_file in excel_files:
+            raw = catalog.find(excel_file)
+            content_hash = raw["content_hash"] if raw else reference_digest(excel_file)
+            if raw is not None:
+                raw_id = raw["id"]
+            elif parser.raw_dir.resolve() in Path(excel_file).resolve().parents:
+                raw_id = catalog.register(excel_file, parser.name, "raw", content_hash=content_hash)
+            else:
+                raw_id = None
+
+            # Parse cache keyed on the workbook's blob hash
+            cached = catalog.derived_from(parser.name, "parsed-monthly-long" if stream else "parsed-monthly", content_hash)
+            if cached and catalog.resolve(cached["path"]).exists() and not force:
+                logger.info(f"Already parsed {excel_file.name} (sha256 {content_hash[:12]}): {cached['path']}")
+                continue
+
+            try:
+                if stream:
+                    outputs = {f"{g}-long": path for g, path in parser.stream_workbook(excel_file, chunk_size).items()}
+                else:
+                    frames = parser.parse_workbook(excel_file)
+                    for granularity, report in parser.reports.items():
+                        path = parser.save_report(report, granularity, excel_file)
+                        catalog.register(path, parser.name, f"validation-{granularity}", [raw_id])
+                    errors = [g for g, report in parser.reports.items() if report["status"] == "error"]
+                    if strict and errors:
+                        logger.error(f"Validation failed for {excel_file} ({', '.join(errors)}), not saving")
+                        failed.append(excel_file)
+                        continue
+                    outputs = {g: parser.save_csv(df, g) for g, df in frames.items()}
+            except Exception as e:
+                logger.error(f"Error processing {excel_file}: {str(e)}")
+                continue
+            for granularity, path in outputs.items():
+                catalog.register(path, parser.name, f"parsed-{granularity}", [raw_id])
+                saved.append(path)
+    if failed:
+        raise ValueError(f"Validation failed for: {', '.join(str(f) for f in failed)}")
+    return saved
+
+def main():
+    import argparse
+    arg_parser = argparse.ArgumentParser(description="Parse raw workbooks of the configured datasets")
+    arg_parser.add_argument("--dataset", "-d", action="append", help="Dataset to parse (default: all)")
+    arg_parser.add_argument("--config", "-c", help="Path to datasets YAML (default config/datasets.yml)", default=None)
+    arg_parser.add_argument("--stream", action="store_true",
+                            help="Bounded-memory mode: stream rows and write long-format CSVs")
+    arg_parser.add_argument("--chunk-size", type=int, default=50000,
+                            help="Records buffered before each write in --stream mode (default 50000)")
+    arg_parser.add_argument("--force", action="store_true",
+                            help="Parse even if the workbook content was already parsed")
+    arg_parser.add_argument("--strict", action=argparse.BooleanOptionalAction, default=None,
+                            help="Do not save workbooks whose validation report has errors "
+                                 "(default: the descriptor's validation.strict)")
+    arg_parser.add_argument("--reader", choices=["auto"] + list(ENGINE_MODULES), default=None,
+                            help="Excel reader engine (default: the descriptor's reader, else auto)")
+    arg_parser.add_argument("files", nargs="*", help="Workbooks to parse (default: the latest raw download)")
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                       format='%(asctime)s - %(levelname)s - %(message)s')
+
+    config_path = Path(args.config) if args.config else None
+    datasets = load_datasets_config(config_path)
+    names = args.dataset or list(datasets)
+    files = [Path(f) for f in args.files] or None
+    failed = []
+    for name in names:
+        parser = get_parser(name, config_path=config_path)
+        if args.reader:
+            parser.reader = args.reader
+        try:
+            parse_dataset(parser, files, stream=args.stream, chunk_size=args.chunk_size,
+                          force=args.force, strict=args.strict)
+        except ValueError as e:
+            logger.error(f"[{name}] {e}")
+            failed.append(name)
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,31 @@
 import json
-import random
 import os
 
-def generate_color():
-    """Generate a random hex color."""
-    return f"#{random.randint(0, 255):02x}{random.randint(0, 255):02x}{random.randint(0, 255):02x}"
+import pandas as pd
+
+from ...etl.catalog import find_latest
+from ..chart_views import (
+    build_drilldown,
+    build_views,
+    change_summary,
+    stable_color,
+    write_drilldown,
+    write_views,
+)
 
 def transform_data():
     # Get the script directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     analytics_dir = os.path.dirname(os.path.dirname(os.path.dirname(script_dir)))
 
-    # Read the source data
-    input_path = os.path.join(analytics_dir, "data/parsed/importation_countries/2025-08-03-monthly-transformed.json")
+    # Read the most recent transformed data (looked up in the artifact catalog)
+    parsed_dir = os.path.join(analytics_dir, "data/parsed/importation_countries")
+    input_path, _ = find_latest(analytics_dir, "importation_countries", "transformed",
+                                parsed_dir, "*-monthly-transformed.json")
+    print(f"Reading data from: {input_path}")
     with open(input_path, "r") as f:
         source_data = json.load(f)
 
-    # Month mapping
-    months = ["January", "February", "March", "April", "May", "June",
-              "July", "August", "September", "October", "November", "December"]
-
     # Define continent colors (using consistent colors for better visualization)
     continent_colors = {
         "AFRIQUE": "#2ecc71",  # Green
@@ -35,76 +41,34 @@ def transform_data():
         for month_data in year_data.values():
             continents.update(month_data.keys())
     continents = sorted(list(continents))
+    colors = {continent: continent_colors.get(continent) or stable_color(continent) for continent in continents}
 
-    # Transform data for visualization
-    chart_data = {
-        "type": "bar",
-        "title": "Monthly Imports by Continent (Million BIF)",
-        "description": "Monthly import values in Million Burundian Francs (BIF) grouped by continent",
-        "years": sorted(source_data.keys()),  # Available years for filtering
-        "data": {},  # Will contain data for each year
-        "options": {
-            "responsive": True,
-            "plugins": {
-                "title": {
-                    "display": True,
-                    "text": "Monthly Imports by Continent (Million BIF)"
-                },
-                "legend": {
-                    "position": "top"
-                },
-                "tooltip": {
-                    "callbacks": {
-                        "label": "function(context) { const value = context.raw.toLocaleString('en-US', { maximumFractionDigits: 0 }); return `${context.dataset.label}: ${value} M BIF`; }"
-                    }
-                }
-            },
-            "scales": {
-                "x": {
-                    "stacked": True,
-                    "title": {
-                        "display": True,
-                        "text": "Month"
-                    }
-                },
-                "y": {
-                    "stacked": True,
-                    "title": {
-                        "display": True,
-                        "text": "Import Value (Million BIF)"
-                    }
-                }
-            }
-        }
-    }
-
-    # Process data for each year
-    for year in sorted(source_data.keys()):
-        year_data = source_data[year]
-
-        # Prepare datasets for each continent
-        datasets = []
-        for continent in continents:
-            dataset = {
-                "label": continent,
-                "data": [year_data.get(month, {}).get(continent, 0) for month in months],
-                "backgroundColor": continent_colors.get(continent, generate_color())
-            }
-            datasets.append(dataset)
-
-        # Add year data
-        chart_data["data"][year] = {
-            "labels": ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
-                      "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"],
-            "datasets": datasets
-        }
+    # Monthly, quarterly and yearly views from one aggregation pass
+    views = build_views(
+        source_data,
+        continents,
+        colors,
+        title="{granularity} Imports by Continent (Million BIF)",
+        description="{granularity} import values in Million Burundian Francs (BIF) grouped by continent",
+    )
 
     # Save the output
     project_root = os.path.dirname(analytics_dir)
-    output_path = os.path.join(project_root, "website/data/monthly_imports_by_continent.json")
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, "w") as f:
-        json.dump(chart_data, f, indent=2)
+    output_dir = os.path.join(project_root, "website/data")
+    changes = write_views(views, output_dir, "imports_by_continent")
+
+    # Per-country drilldown, from the latest parsed CSV, sharded by continent
+    csv_path, _ = find_latest(analytics_dir, "importation_countries", "parsed-monthly",
+                              parsed_dir, "*-monthly.csv")
+    print(f"Reading country data from: {csv_path}")
+    drilldown = build_drilldown(
+        pd.read_csv(csv_path),
+        "continent",
+        "country",
+        title="Monthly Imports by Country (Million BIF)",
+    )
+    changes.update(write_drilldown(drilldown, output_dir, "imports_by_country"))
+    print(f"Visualization data in {output_dir}: {change_summary(changes)}")
 
 if __name__ == "__main__":
     transform_data()
@@ -3,17 +3,15 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+from ...etl.catalog import Catalog, find_latest
+
 def transform_csv_to_json():
     # Get the project root directory
     project_root = Path(__file__).parents[3]
 
-    # Find the most recent CSV file
+    # Find the most recent parsed CSV through the artifact catalog
     parsed_dir = project_root / "data" / "parsed" / "importation_countries"
-    csv_files = list(parsed_dir.glob("*-monthly.csv"))
-    if not csv_files:
-        raise FileNotFoundError(f"No CSV files found in {parsed_dir}")
-
-    csv_path = sorted(csv_files)[-1]
+    csv_path, csv_id = find_latest(project_root, "importation_countries", "parsed-monthly", parsed_dir, "*-monthly.csv")
 
     # Read the CSV file
     df = pd.read_csv(csv_path)
@@ -58,6 +56,8 @@ def transform_csv_to_json():
     # Save to JSON
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(result, f, indent=2, ensure_ascii=False)
+    with Catalog(project_root) as catalog:
+        catalog.register(output_file, "importation_countries", "transformed", [csv_id])
 
     print(f"Transformed data saved to: {output_file}")
 
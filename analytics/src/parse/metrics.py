@@ -0,0 +1,165 @@
+import json
+import logging
+import time
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..etl.catalog import Catalog, find_latest
+from .engine import get_parser, load_datasets_config
+
+logger = logging.getLogger(__name__)
+
+def load_series_matrix(csv_path: Path, group_column: str, key_column: str) -> tuple:
+    """
+    Read a parsed monthly CSV into (series, periods, values): one row per
+    item, per group (sum of its items) and for the total, over a
+    contiguous monthly period axis (months missing from the CSV are NaN).
+    series is a frame with level / group / label columns.
+    """
+    df = pd.read_csv(csv_path, dtype={key_column: str})
+    period_cols = [c for c in df.columns if c not in (group_column, key_column) and len(c) == 7 and c[4] == "-"]
+    periods = pd.period_range(min(period_cols), max(period_cols), freq="M").strftime("%Y-%m").tolist()
+    items = df[period_cols].reindex(columns=periods).astype(float)
+
+    blocks = [items.to_numpy()]
+    series = [pd.DataFrame({"level": "item", "group": df[group_column] if group_column else None,
+                            "label": df[key_column]})]
+    if group_column:
+        groups = items.groupby(df[group_column].to_numpy()).sum(min_count=1)
+        blocks.append(groups.to_numpy())
+        series.append(pd.DataFrame({"level": "group", "group": groups.index, "label": groups.index}))
+    blocks.append(items.sum(axis=0, min_count=1).to_numpy()[None, :])
+    series.append(pd.DataFrame({"level": "total", "group": [None], "label": ["Total"]}))
+    return pd.concat(series, ignore_index=True), periods, np.vstack(blocks)
+
+def window_sums(values: np.ndarray, before: int, after: int) -> np.ndarray:
+    """
+    Sum of every row over the window [t - before, t + after] for each
+    period t, from one cumulative sum along the period axis. Windows that
+    run off the axis or contain a missing value are NaN.
+    """
+    n, periods = values.shape
+    present = np.isfinite(values)
+    csum = np.zeros((n, periods + 1))
+    np.cumsum(np.where(present, values, 0.0), axis=1, out=csum[:, 1:])
+    ccount = np.zeros((n, periods + 1))
+    np.cumsum(present, axis=1, out=ccount[:, 1:])
+
+    # Windows fully inside the axis are t = before .. periods - after - 1
+    width = before + after + 1
+    result = np.full((n, periods), np.nan)
+    if width > periods:
+        return result
+    inside = slice(before, periods - after)
+    result[:, inside] = csum[:, width:] - csum[:, :periods + 1 - width]
+    counts = ccount[:, width:] - ccount[:, :periods + 1 - width]
+    result[:, inside][counts < width] = np.nan
+    return result
+
+def compute_metrics(values: np.ndarray, first_month: int) -> dict:
+    """
+    Metrics for every row of a (series, months) matrix at once.
+    first_month: calendar month (1-12) of the first column.
+    - rolling_12: total of the last 12 months (NaN until 12 months exist)
+    - yoy_pct: growth against the same month a year earlier, in %
+      (NaN when that month is missing or zero)
+    - seasonal_index: 12 values per series, the average ratio of each
+      calendar month to its centred 2x12 moving average, scaled so the
+      year averages 100
+    """
+    n, periods = values.shape
+    rolling = window_sums(values, 11, 0)
+
+    yoy = np.full((n, periods), np.nan)
+    previous = values[:, :-12]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        yoy[:, 12:] = np.where(previous != 0, (values[:, 12:] / previous - 1) * 100, np.nan)
+
+        # Centred 2x12 moving average = mean of the two 12-month windows around t
+        trend = (window_sums(values, 6, 5) + window_sums(values, 5, 6)) / 24
+        ratio = np.where(trend > 0, values / trend, np.nan)
+
+    # Align the period axis on calendar years, then average each month over the years
+    lead = first_month - 1
+    tail = (-(lead + periods)) % 12
+    padded = np.pad(ratio, ((0, 0), (lead, tail)), constant_values=np.nan)
+    by_month = padded.reshape(n, -1, 12)
+    with warnings.catch_warnings():
+        # Months never observed are all-NaN slices; they stay NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        seasonal = np.nanmean(by_month, axis=1)
+        seasonal = seasonal / np.nanmean(seasonal, axis=1, keepdims=True) * 100
+
+    return {"rolling_12": rolling, "yoy_pct": yoy, "seasonal_index": seasonal}
+
+def to_json_matrix(values: np.ndarray, decimals: int) -> list:
+    """Round a matrix and replace NaN with None for JSON"""
+    rounded = np.round(values, decimals)
+    return np.where(np.isfinite(rounded), rounded, None).tolist()
+
+def build_metrics(name: str, data_root: Path = None, config_path: Path = None) -> Path:
+    """
+    Compute the metrics of the latest parsed monthly CSV of a dataset and
+    save them, column-oriented, as <date>-metrics.json next to it.
+    Registered in the catalog as stage "metrics". Returns the path.
+    """
+    parser = get_parser(name, data_root, config_path)
+    project_root = parser.data_root
+    csv_path, csv_id = find_latest(project_root, name, "parsed-monthly", parser.parsed_dir, "*-monthly.csv")
+    series, periods, values = load_series_matrix(csv_path, parser.group_column, parser.key_column)
+
+    start = time.perf_counter()
+    metrics = compute_metrics(values, int(periods[0][5:7]))
+    elapsed = (time.perf_counter() - start) * 1000
+    logger.info(f"[{name}] Computed metrics for {values.shape[0]} series x {values.shape[1]} months in {elapsed:.1f} ms")
+
+    payload = {
+        "dataset": name,
+        "source": csv_path.name,
+        "periods": periods,
+        "series": {
+            column: [None if pd.isna(v) else v for v in series[column]]
+            for column in series.columns
+        },
+        "rolling_12": to_json_matrix(metrics["rolling_12"], 2),
+        "yoy_pct": to_json_matrix(metrics["yoy_pct"], 2),
+        "seasonal_index": to_json_matrix(metrics["seasonal_index"], 2),
+    }
+    today = datetime.now().strftime("%Y-%m-%d")
+    output_file = parser.parsed_dir / f"{today}-metrics.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    with Catalog(project_root) as catalog:
+        catalog.register(output_file, name, "metrics", [csv_id] if csv_id else [])
+    logger.info(f"[{name}] Saved metrics to: {output_file}")
+    return output_file
+
+def main():
+    import argparse
+    arg_parser = argparse.ArgumentParser(description="Compute YoY growth, rolling totals and seasonal indices")
+    arg_parser.add_argument("--dataset", "-d", action="append",
+                            help="Dataset name from config/datasets.yml (repeatable; default: all)")
+    arg_parser.add_argument("--config", help="Path to datasets config (default config/datasets.yml)", default=None)
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                       format='%(asctime)s - %(levelname)s - %(message)s')
+
+    config_path = Path(args.config) if args.config else None
+    names = args.dataset or list(load_datasets_config(config_path))
+    for name in names:
+        try:
+            build_metrics(name, config_path=config_path)
+        except FileNotFoundError as e:
+            # Datasets that were never parsed are skipped, so one source's
+            # downstream chain does not fail on another source's state
+            if args.dataset:
+                raise
+            logger.warning(f"[{name}] Skipped: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Defaults for the optional `validation:` section of a dataset descriptor
+DEFAULT_RULES = {
+    "total_row": r"^total\b",     # regex (case-insensitive) for the sheet's grand total row
+    "group_total_rows": False,    # rows labelled with a group name are that group's subtotal
+    "tolerance_abs": 1.0,         # allowed |sum - total| before a period is flagged
+    "tolerance_rel": 0.001,       # ... or this fraction of the total, whichever is larger
+    "outlier_mad": 10.0,          # robust z-score (per series) above which a value is an outlier
+    "metadata_row": r"^(sources?|notes?)\b|^\(",  # regex for notes / source lines below the table
+    "max_cells": 50,              # cells listed per check in the report
+}
+
+def fold(label) -> str:
+    """Case- and accent-insensitive form of a label ("Amérique" -> "amerique")"""
+    text = unicodedata.normalize("NFKD", str(label)).encode("ascii", "ignore").decode()
+    return re.sub(r"\s+", " ", text).strip().casefold()
+
+def cell_list(mask: pd.DataFrame, labels: pd.Series, frame: pd.DataFrame, limit: int) -> list:
+    rows, cols = np.nonzero(mask.to_numpy())
+    cells = []
+    for r, c in zip(rows[:limit], cols[:limit]):
+        value = frame.iat[r, c]
+        cells.append({
+            "label": str(labels.iloc[r]),
+            "period": mask.columns[c],
+            "value": value.item() if hasattr(value, "item") else value,
+        })
+    return cells
+
+def reconcile(expected: pd.Series, reported: pd.Series, rules: dict) -> dict:
+    diff = (expected - reported).abs()
+    allowed = np.maximum(rules["tolerance_abs"], rules["tolerance_rel"] * reported.abs())
+    bad = diff > allowed
+    return {
+        "status": "mismatch" if bad.any() else "ok",
+        "max_abs_diff": round(float(diff.max()), 4) if len(diff) else 0.0,
+        "mismatched_periods": list(diff.index[bad]),
+    }
+
+def validate_sheet(
+    labels: pd.Series,
+    valid: pd.Series,
+    raw_values: pd.DataFrame,
+    values: pd.DataFrame,
+    groups: pd.Series,
+    rules: dict = None
+) -> dict:
+    """
+    Check one parsed sheet, reusing the arrays the parser already built.
+    labels: cleaned first-column label of every body row
+    valid: rows kept by the parser (label found in the reference map)
+    raw_values / values: period block as read / after pd.to_numeric(errors='coerce')
+    groups: group of each kept row (None when the dataset has no reference)
+    Counts cells that were coerced to 0.0, flags negative values and per-series
+    outliers, and reconciles group and grand totals against the sheet's own
+    total rows. The grand total is checked against every body row (not a
+    total, subtotal or metadata row), kept or not, so it tells whether the
+    workbook adds up; the part of the total coming from labels outside the
+    reference is reported separately. Returns a JSON-serialisable report.
+    """
+    rules = {**DEFAULT_RULES, **(rules or {})}
+    limit = rules["max_cells"]
+    kept_raw = raw_values[valid]
+    kept = values[valid]
+    kept_labels = labels[valid]
+
+    # Cells that were not numbers and silently became 0.0
+    coerced = kept_raw.notna() & kept.isna() & (kept_raw.astype(str).apply(lambda c: c.str.strip()) != "")
+    coerced_values = kept_raw.where(coerced).stack()
+    coerced_report = {
+        "count": int(coerced.to_numpy().sum()),
+        "by_value": {str(k): int(v) for k, v in coerced_values.astype(str).value_counts().items()},
+        "cells": cell_list(coerced, kept_labels, kept_raw.astype(str), limit),
+    }
+
+    negative = kept < 0
+    negative_report = {
+        "count": int(negative.to_numpy().sum()),
+        "cells": cell_list(negative, kept_labels, kept, limit),
+    }
+
+    # Robust z-score of each value against its own series (median / MAD over periods)
+    matrix = kept.to_numpy(dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        median = np.nanmedian(matrix, axis=1, keepdims=True) if matrix.size else matrix
+        mad = np.nanmedian(np.abs(matrix - median), axis=1, keepdims=True) if matrix.size else matrix
+        score = np.abs(matrix - median) / (1.4826 * mad)
+    outliers = pd.DataFrame(np.nan_to_num(score, nan=0.0, posinf=0.0) > rules["outlier_mad"],
+                            index=kept.index, columns=kept.columns)
+    outlier_report = {
+        "count": int(outliers.to_numpy().sum()),
+        "threshold": rules["outlier_mad"],
+        "cells": cell_list(outliers, kept_labels, kept, limit),
+    }
+
+    # Split the rows the parser dropped into structural rows (totals, group
+    # subtotals, notes) and body rows whose label is not in the reference
+    filled = kept.fillna(0.0)
+    other = ~valid
+    folded = labels[other].map(fold)
+    group_names = {fold(g) for g in groups[valid].unique()} if groups is not None else set()
+    total_pattern = re.compile(rules["total_row"], re.IGNORECASE) if rules["total_row"] else None
+    metadata_pattern = re.compile(rules["metadata_row"], re.IGNORECASE) if rules["metadata_row"] else None
+    is_total = folded.map(lambda label: bool(total_pattern and total_pattern.search(label)))
+    is_subtotal = folded.str.replace(r"^total\s+", "", regex=True).isin(group_names)
+    is_metadata = folded.map(lambda label: bool(metadata_pattern and metadata_pattern.search(label)))
+    blank = folded.isin(["", "nan"]) | values.loc[folded.index].isna().all(axis=1)
+    unreferenced = folded.index[~(is_total | is_subtotal | is_metadata | blank)]
+    body = values.loc[kept.index.union(unreferenced)].fillna(0.0)
+
+    reconciliation = {}
+    if total_pattern is not None:
+        total_rows = folded[is_total & ~is_subtotal]
+        if len(total_rows):
+            reported = values.loc[total_rows.index[0]].fillna(0.0)
+            reconciliation["grand_total"] = {"label": labels[total_rows.index[0]],
+                                             **reconcile(body.sum(), reported, rules)}
+        else:
+            reconciliation["grand_total"] = {"status": "missing"}
+
+    # Share of the sheet total coming from rows the reference does not map
+    unreferenced_sum = float(body.loc[unreferenced].to_numpy().sum()) if len(unreferenced) else 0.0
+    body_sum = float(body.to_numpy().sum())
+    unreferenced_report = {
+        "labels": sorted({str(label) for label in labels[unreferenced]}),
+        "value": round(unreferenced_sum, 4),
+        "share": round(unreferenced_sum / body_sum, 6) if body_sum else 0.0,
+    }
+
+    if rules["group_total_rows"] and groups is not None:
+        sums = filled.groupby(groups[valid]).sum()
+        stripped = folded.str.replace(r"^total\s+", "", regex=True)
+        group_checks = {}
+        for group, expected in sums.iterrows():
+            matches = stripped[stripped == fold(group)]
+            if len(matches):
+                reported = values.loc[matches.index[0]].fillna(0.0)
+                group_checks[group] = {"label": labels[matches.index[0]],
+                                       **reconcile(expected, reported, rules)}
+            else:
+                group_checks[group] = {"status": "missing"}
+        reconciliation["groups"] = group_checks
+
+    checks = list(reconciliation.get("groups", {}).values()) + (
+        [reconciliation["grand_total"]] if "grand_total" in reconciliation else []
+    )
+    if negative_report["count"] or any(c["status"] == "mismatch" for c in checks):
+        status = "error"
+    elif (coerced_report["count"] or outlier_report["count"] or unreferenced_report["labels"]
+          or any(c["status"] == "missing" for c in checks)):
+        status = "warning"
+    else:
+        status = "ok"
+
+    return {
+        "status": status,
+        "rows": int(valid.sum()),
+        "periods": int(values.shape[1]),
+        "unmatched_labels": unreferenced_report["labels"],
+        "unreferenced": unreferenced_report,
+        "coerced_cells": coerced_report,
+        "negative_values": negative_report,
+        "outliers": outlier_report,
+        "reconciliation": reconciliation,
+    }
@@ -0,0 +1,55 @@
+"""
+Regenerate the reader parity samples: a one-year synthetic countries
+workbook (see src/bench/mock_brb.py) with a non-numeric cell and an annual
+sheet, saved as .xlsx and, through xlwt (not a project dependency), as .xls.
+Run from analytics/: python tests/data/make_samples.py
+"""
+import io
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import xlwt
+from openpyxl import load_workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from src.bench.mock_brb import synthetic_workbook
+
+HERE = Path(__file__).resolve().parent
+REFERENCE = HERE.parents[1] / "src" / "parse" / "importation_countries" / "countries.csv"
+
+def main():
+    countries = set(pd.read_csv(REFERENCE)["country"])
+    wb = load_workbook(io.BytesIO(synthetic_workbook(years=1, seed=7)))
+    ws = wb["Mensuelle"]
+    # One "-" cell (read as 0.0), taken out of its continent subtotal and the
+    # TOTAL row so the sample still reconciles
+    removed = ws.cell(row=6, column=4).value
+    ws.cell(row=6, column=4, value="-")
+    subtotal_row = next(r for r in range(6, ws.max_row + 1)
+                        if ws.cell(row=r, column=1).value not in countries)
+    total_row = next(r for r in range(6, ws.max_row + 1) if ws.cell(row=r, column=1).value == "TOTAL")
+    for r in (subtotal_row, total_row):
+        ws.cell(row=r, column=4, value=ws.cell(row=r, column=4).value - removed)
+    annual = wb.create_sheet("Annuelle")
+    annual.append(["Pays de destination", 2003])
+    for row in ws.iter_rows(min_row=5, values_only=True):
+        if row[0] and row[0] != "Source: BRB":
+            annual.append([row[0], sum(v for v in row[1:] if isinstance(v, (int, float)))])
+    wb.save(HERE / "countries_sample.xlsx")
+
+    book = xlwt.Workbook()
+    date_style = xlwt.easyxf(num_format_str="YYYY-MM-DD")
+    for sheet in wb.worksheets:
+        out = book.add_sheet(sheet.title)
+        for r, row in enumerate(sheet.iter_rows(values_only=True)):
+            for c, value in enumerate(row):
+                if isinstance(value, datetime):
+                    out.write(r, c, value, date_style)
+                elif value is not None:
+                    out.write(r, c, value)
+    book.save(str(HERE / "countries_sample.xls"))
+
+if __name__ == "__main__":
+    main()
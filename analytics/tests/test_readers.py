@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.bench.readers import compare_frames
+from src.etl.blob_store import workbook_suffix
+from src.parse.engine import READER_ENGINES, engine_available, get_parser
+
+SAMPLES = Path(__file__).parent / "data"
+
+@pytest.mark.parametrize("sample", ["countries_sample.xlsx", "countries_sample.xls"])
+def test_reader_engines_parse_identically(sample, tmp_path):
+    """Every installed engine for the format yields the same frames and validation reports"""
+    path = SAMPLES / sample
+    engines = [engine for engine in READER_ENGINES[workbook_suffix(path)] if engine_available(engine)]
+    if len(engines) < 2:
+        pytest.skip(f"only {engines} installed for {path.suffix}")
+
+    parser = get_parser("importation_countries", data_root=tmp_path)
+    results = {}
+    for engine in engines:
+        parser.reader = engine
+        results[engine] = (parser.parse_workbook(path), parser.reports)
+
+    reference_frames, reference_reports = results[engines[0]]
+    assert set(reference_frames) == {"monthly", "annual"}
+    assert len(reference_frames["monthly"]) > 0
+    assert reference_reports["monthly"]["coerced_cells"]["count"] == 1
+    assert {report["status"] for report in reference_reports.values()} <= {"ok", "warning"}
+    for engine in engines[1:]:
+        frames, reports = results[engine]
+        assert compare_frames(reference_frames, frames) == [], engine
+        for granularity, frame in reference_frames.items():
+            pd.testing.assert_frame_equal(frame, frames[granularity], check_exact=True)
+        assert reports == reference_reports, engine
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import re
+import shutil
+from pathlib import Path
+
+WEBSITE_DIR = Path(__file__).parent
+
+# Assets that also get a content-hashed copy (name.<hash>.ext)
+FINGERPRINTED = ["styles.css", "js/**/*.js", "data/**/*.json"]
+# Mutable entry points: the manifest itself and the pages referencing it
+MANIFEST = "data/chart_files.json"
+PAGES = ["index.html"]
+HASH_LENGTH = 10
+FINGERPRINT_RE = re.compile(rf"\.[0-9a-f]{{{HASH_LENGTH}}}\.(?:js|css|json)$")
+
+def is_fingerprinted(path: str) -> bool:
+    """Whether a file name carries a content hash (safe to cache forever)."""
+    return FINGERPRINT_RE.search(path) is not None
+
+def fingerprinted_name(rel_path: str, content: bytes) -> str:
+    """data/x.json -> data/x.<first hex digits of its sha256>.json"""
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    path = Path(rel_path)
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+def rewrite_references(html: str, assets: dict) -> str:
+    """Point src/href attributes of a page at the hashed asset names."""
+    return re.sub(
+        r'(\b(?:src|href)=")([^"]+)(")',
+        lambda m: m.group(1) + assets.get(m.group(2), m.group(2)) + m.group(3),
+        html,
+    )
+
+def build_site(source: Path = WEBSITE_DIR, output: Path = None) -> dict:
+    """
+    Copy the website to output (default <source>/_site) with a content-hashed
+    copy of every data file, script and stylesheet. The asset map is added
+    to the chart_files.json manifest under "assets", which the charts resolve
+    data names through, and index.html is rewritten to load the hashed
+    scripts and stylesheet. Plain names are kept alongside, so old links
+    keep working. Returns the manifest.
+    """
+    source = source.resolve()
+    output = (output or source / "_site").resolve()
+    if output == source:
+        raise ValueError("Output directory must differ from the website directory")
+    if output.exists():
+        shutil.rmtree(output)
+
+    def ignore(directory, names):
+        skipped = {name for name in names if name.endswith(".py") or name == "__pycache__"}
+        return skipped | {name for name in names if (Path(directory) / name).resolve() == output}
+
+    shutil.copytree(source, output, ignore=ignore)
+
+    assets = {}
+    for pattern in FINGERPRINTED:
+        for path in sorted(output.glob(pattern)):
+            rel_path = path.relative_to(output).as_posix()
+            if rel_path == MANIFEST or is_fingerprinted(rel_path):
+                continue
+            content = path.read_bytes()
+            hashed = fingerprinted_name(rel_path, content)
+            (output / hashed).write_bytes(content)
+            assets[rel_path] = hashed
+
+    manifest_path = output / MANIFEST
+    manifest = {}
+    if manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    manifest["assets"] = dict(sorted(assets.items()))
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    for page in PAGES:
+        page_path = output / page
+        if page_path.exists():
+            page_path.write_text(rewrite_references(page_path.read_text(encoding="utf-8"), assets), encoding="utf-8")
+
+    print(f"Built {output} with {len(assets)} fingerprinted assets")
+    return manifest
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the website with content-hashed asset names")
+    parser.add_argument("--output", "-o", default=None, help="Output directory (default: website/_site)")
+
+    args = parser.parse_args()
+    build_site(output=Path(args.output) if args.output else None)
@@ -1,7 +1,38 @@
 class BaseChart {
-  constructor(containerId) {
+  // Content-hashed names of the data files, from the "assets" map of
+  // data/chart_files.json written by build.py; in an unbuilt site the map is
+  // empty and every name resolves to itself
+  static assets = {};
+
+  static async loadManifest() {
+    try {
+      const response = await fetch("data/chart_files.json", { cache: "no-cache" });
+      if (response.ok) {
+        BaseChart.assets = (await response.json()).assets || {};
+      }
+    } catch (error) {
+      console.warn("Asset manifest unavailable, using plain file names:", error);
+    }
+  }
+
+  static assetUrl(path) {
+    return BaseChart.assets[path] || path;
+  }
+
+  constructor(containerId, dataName = null) {
     this.containerId = containerId;
     this.chart = null;
+    // Chart data files are named <granularity>_<dataName>.json
+    this.dataName = dataName;
+    this.granularity = "monthly";
+    this.views = {};
+    // Monthly data is split into one file per year, fetched on first use
+    this.yearData = {};
+    this.renderedYear = null;
+    // Drilldown: index of items and per-group shards, fetched on first use
+    this.drilldownIndex = null;
+    this.shards = {};
+    this.renderedItem = null;
   }
 
   destroy() {
@@ -12,12 +43,162 @@ class BaseChart {
   }
 
   parseTooltipCallback(options) {
-    if (options?.plugins?.tooltip?.callbacks?.label) {
-      const labelFnStr = options.plugins.tooltip.callbacks.label;
+    const labelFnStr = options?.plugins?.tooltip?.callbacks?.label;
+    if (typeof labelFnStr === "string") {
       options.plugins.tooltip.callbacks.label = new Function(
         "return " + labelFnStr
       )();
     }
     return options;
   }
-}
\ No newline at end of file
+
+  // Fetch (once) the precomputed view for a granularity: monthly, quarterly or yearly
+  async fetchView(granularity) {
+    if (!this.views[granularity]) {
+      const response = await fetch(BaseChart.assetUrl(`data/${granularity}_${this.dataName}.json`));
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      this.views[granularity] = await response.json();
+    }
+    return this.views[granularity];
+  }
+
+  // Fetch (once) the monthly data of one year from its shard
+  async fetchYear(year) {
+    const view = await this.fetchView("monthly");
+    if (view.data) {
+      return view.data[year];
+    }
+    if (!this.yearData[year]) {
+      const response = await fetch(BaseChart.assetUrl(`data/${view.shards[year]}`));
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      this.yearData[year] = await response.json();
+    }
+    return this.yearData[year];
+  }
+
+  // Render one year of the monthly view; a slow fetch for a year the user has
+  // already moved away from does not overwrite the newer chart
+  async showYear(year) {
+    this.renderedYear = year;
+    const yearData = await this.fetchYear(year);
+    if (this.renderedYear === year && this.granularity === "monthly") {
+      this.updateChart(year, yearData);
+    }
+  }
+
+  // Fetch (once) the drilldown index data/drilldown_<name>.json: every item
+  // with its group, total and the id of the shard holding its series
+  async fetchDrilldownIndex(name) {
+    if (!this.drilldownIndex) {
+      const response = await fetch(BaseChart.assetUrl(`data/drilldown_${name}.json`));
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      this.drilldownIndex = await response.json();
+    }
+    return this.drilldownIndex;
+  }
+
+  // Fetch (once) one shard of the drilldown; concurrent callers share the request
+  fetchShard(shardId) {
+    if (!this.shards[shardId]) {
+      this.shards[shardId] = fetch(BaseChart.assetUrl(`data/${this.drilldownIndex.shards[shardId]}`)).then(
+        (response) => {
+          if (!response.ok) {
+            delete this.shards[shardId];
+            throw new Error(`HTTP error! status: ${response.status}`);
+          }
+          return response.json();
+        }
+      );
+    }
+    return this.shards[shardId];
+  }
+
+  // Render the series of one drilldown item, fetching only its group's shard
+  async showDrilldown(name) {
+    const index = this.drilldownIndex;
+    const item = index.items.find((entry) => entry.name === name);
+    if (!item) {
+      return;
+    }
+    this.renderedItem = name;
+    const shard = await this.fetchShard(item.shard);
+    if (this.renderedItem !== name) {
+      return;
+    }
+    this.renderSeries(
+      {
+        type: index.type,
+        title: index.title,
+        options: index.options,
+        labels: index.periods,
+        datasets: [{ label: name, data: shard.series[name] }],
+      },
+      `${name} (${item[index.group_field]})`
+    );
+  }
+
+  setupGranularitySelect(selectId) {
+    const select = document.getElementById(selectId);
+    if (!select) {
+      return;
+    }
+    select.value = this.granularity;
+    select.addEventListener("change", (e) => {
+      this.setGranularity(e.target.value).catch((error) =>
+        console.error("Error loading view:", error)
+      );
+    });
+  }
+
+  // Monthly charts show one year at a time via the year slider; quarterly and
+  // yearly views cover every year in a single series
+  async setGranularity(granularity) {
+    const view = await this.fetchView(granularity);
+    this.granularity = granularity;
+    const sliderSection = this.yearSlider?.closest(".slider-section");
+    if (sliderSection) {
+      sliderSection.style.display = granularity === "monthly" ? "" : "none";
+    }
+    if (granularity === "monthly") {
+      const year = this.data.years[this.yearSlider.value];
+      this.yearDisplay.textContent = year;
+      await this.showYear(year);
+    } else {
+      const years = view.years;
+      const range = `${years[0]}–${years[years.length - 1]}`;
+      this.yearDisplay.textContent = range;
+      this.renderSeries(view, range);
+    }
+  }
+
+  renderSeries(view, label) {
+    this.destroy();
+
+    const ctx = document.getElementById(this.containerId).getContext("2d");
+    const config = getChartConfig(
+      view.type,
+      { labels: view.labels, datasets: view.datasets },
+      this.parseTooltipCallback(view.options),
+      view.title,
+      label
+    );
+
+    this.chart = new Chart(ctx, config);
+  }
+
+  refresh() {
+    if (this.granularity === "monthly") {
+      this.showYear(this.data.years[this.yearSlider.value]).catch((error) =>
+        console.error("Error loading year:", error)
+      );
+    } else {
+      this.setGranularity(this.granularity);
+    }
+  }
+}
@@ -1,6 +1,6 @@
 class CategoryImportsChart extends BaseChart {
   constructor(containerId) {
-    super(containerId);
+    super(containerId, "imports_by_category");
     this.data = null;
     this.yearSlider = null;
     this.yearDisplay = null;
@@ -10,18 +10,17 @@ class CategoryImportsChart extends BaseChart {
     try {
       console.log("Initializing CategoryImportsChart...");
       // Fetch the chart data
-      const response = await fetch("data/monthly_imports_by_category.json");
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-      this.data = await response.json();
+      this.data = await this.fetchView("monthly");
       console.log("Category data loaded:", this.data);
 
       // Set up year slider and get initial year
       const initialYear = this.setupYearSlider();
 
       // Initialize chart with the initial year
-      this.updateChart(initialYear);
+      await this.showYear(initialYear);
+
+      // Let the user switch between monthly, quarterly and yearly views
+      this.setupGranularitySelect("categoryGranularity");
 
       // Add window resize handler
       this.handleResize();
@@ -35,7 +34,7 @@ class CategoryImportsChart extends BaseChart {
     window.addEventListener("resize", () => {
       clearTimeout(resizeTimer);
       resizeTimer = setTimeout(() => {
-        this.updateChart(this.data.years[this.yearSlider.value]);
+        this.refresh();
       }, 250);
     });
   }
@@ -57,17 +56,18 @@ class CategoryImportsChart extends BaseChart {
     this.yearSlider.addEventListener("input", (e) => {
       const selectedYear = this.data.years[e.target.value];
       this.yearDisplay.textContent = selectedYear;
-      this.updateChart(selectedYear);
+      this.showYear(selectedYear).catch((error) =>
+        console.error("Error loading year:", error)
+      );
     });
 
     return this.data.years[this.yearSlider.value];
   }
 
-  updateChart(year) {
+  updateChart(year, yearData) {
     this.destroy();
 
     const ctx = document.getElementById(this.containerId).getContext("2d");
-    const yearData = this.data.data[year];
 
     // Get responsive configuration
     const config = getChartConfig(
@@ -1,6 +1,6 @@
 class ContinentImportsChart extends BaseChart {
   constructor(containerId) {
-    super(containerId);
+    super(containerId, "imports_by_continent");
     this.data = null;
     this.yearSlider = null;
     this.yearDisplay = null;
@@ -9,14 +9,16 @@ class ContinentImportsChart extends BaseChart {
   async initialize() {
     try {
       // Fetch the chart data
-      const response = await fetch("data/monthly_imports_by_continent.json");
-      this.data = await response.json();
+      this.data = await this.fetchView("monthly");
 
       // Set up year slider and get initial year
       const initialYear = this.setupYearSlider();
 
       // Initialize chart with the initial year
-      this.updateChart(initialYear);
+      await this.showYear(initialYear);
+
+      // Let the user switch between monthly, quarterly and yearly views
+      this.setupGranularitySelect("continentGranularity");
 
       // Add window resize handler
       this.handleResize();
@@ -30,7 +32,7 @@ class ContinentImportsChart extends BaseChart {
     window.addEventListener("resize", () => {
       clearTimeout(resizeTimer);
       resizeTimer = setTimeout(() => {
-        this.updateChart(this.data.years[this.yearSlider.value]);
+        this.refresh();
       }, 250);
     });
   }
@@ -52,17 +54,18 @@ class ContinentImportsChart extends BaseChart {
     this.yearSlider.addEventListener("input", (e) => {
       const selectedYear = this.data.years[e.target.value];
       this.yearDisplay.textContent = selectedYear;
-      this.updateChart(selectedYear);
+      this.showYear(selectedYear).catch((error) =>
+        console.error("Error loading year:", error)
+      );
     });
 
     return this.data.years[this.yearSlider.value];
   }
 
-  updateChart(year) {
+  updateChart(year, yearData) {
     this.destroy();
 
     const ctx = document.getElementById(this.containerId).getContext("2d");
-    const yearData = this.data.data[year];
 
     // Get responsive configuration
     const config = getChartConfig(
@@ -0,0 +1,70 @@
+class CountryImportsChart extends BaseChart {
+  constructor(containerId) {
+    super(containerId, "imports_by_country");
+    this.countrySelect = null;
+  }
+
+  async initialize() {
+    try {
+      // Fetch the country index; series are fetched per continent shard
+      const index = await this.fetchDrilldownIndex(this.dataName);
+
+      this.setupCountrySelect(index);
+
+      // Initialize chart with the country with the largest imports
+      await this.showDrilldown(this.countrySelect.value);
+
+      // Add window resize handler
+      this.handleResize();
+    } catch (error) {
+      console.error("Error initializing country visualization:", error);
+      // Country data is optional; hide the entry when it was not built
+      document.querySelector('.viz-btn[data-viz="country"]')?.remove();
+    }
+  }
+
+  handleResize() {
+    let resizeTimer;
+    window.addEventListener("resize", () => {
+      clearTimeout(resizeTimer);
+      resizeTimer = setTimeout(() => {
+        this.showDrilldown(this.countrySelect.value);
+      }, 250);
+    });
+  }
+
+  setupCountrySelect(index) {
+    this.countrySelect = document.getElementById("countrySelect");
+
+    // One group of options per continent, countries by total imports
+    const groups = {};
+    index.items.forEach((item) => {
+      const group = item[index.group_field];
+      (groups[group] = groups[group] || []).push(item);
+    });
+    Object.keys(groups)
+      .sort()
+      .forEach((group) => {
+        const optgroup = document.createElement("optgroup");
+        optgroup.label = group;
+        groups[group]
+          .sort((a, b) => b.total - a.total)
+          .forEach((item) => {
+            const option = document.createElement("option");
+            option.value = item.name;
+            option.textContent = item.name;
+            optgroup.appendChild(option);
+          });
+        this.countrySelect.appendChild(optgroup);
+      });
+
+    const largest = index.items.reduce((a, b) => (b.total > a.total ? b : a));
+    this.countrySelect.value = largest.name;
+
+    this.countrySelect.addEventListener("change", (e) => {
+      this.showDrilldown(e.target.value).catch((error) =>
+        console.error("Error loading country:", error)
+      );
+    });
+  }
+}
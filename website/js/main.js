@@ -1,10 +1,15 @@
 document.addEventListener("DOMContentLoaded", async () => {
-  // Initialize both charts
+  // Resolve data file names through the asset manifest before any chart fetches
+  await BaseChart.loadManifest();
+
+  // Initialize the charts
   const continentChart = new ContinentImportsChart("importChart");
   const categoryChart = new CategoryImportsChart("categoryChart");
+  const countryChart = new CountryImportsChart("countryChart");
   
   await continentChart.initialize();
   await categoryChart.initialize();
+  await countryChart.initialize();
 
   // Handle visualization toggle
   const vizBtns = document.querySelectorAll('.viz-btn');
@@ -5,10 +5,16 @@ from pathlib import Path
 from openpyxl.styles import Font
 
 def load_json_data():
-    """Load the monthly imports data from JSON file."""
-    data_path = Path(__file__).parent.parent.parent / "data" / "monthly_imports_by_continent.json"
-    with open(data_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Load the monthly imports data, reading each year from its shard file."""
+    data_dir = Path(__file__).parent.parent.parent / "data"
+    with open(data_dir / "monthly_imports_by_continent.json", 'r', encoding='utf-8') as f:
+        json_data = json.load(f)
+    if 'data' not in json_data:
+        json_data['data'] = {}
+        for year, shard in json_data['shards'].items():
+            with open(data_dir / shard, 'r', encoding='utf-8') as f:
+                json_data['data'][year] = json.load(f)
+    return json_data
 
 def flatten_data(json_data):
     """Convert hierarchical JSON data to flat structure."""
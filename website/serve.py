@@ -3,14 +3,31 @@ import http.server
 import socketserver
 import argparse
 
-def run_server(port=8000, bind="0.0.0.0"):
+from build import is_fingerprinted
+
+# Content-hashed assets never change under their name; everything else
+# (pages, the asset manifest, plain names) is revalidated on every visit
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+class CachingHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler that sends Cache-Control based on the file name."""
+
+    def end_headers(self):
+        path = self.path.split("?", 1)[0]
+        self.send_header("Cache-Control", IMMUTABLE if is_fingerprinted(path) else REVALIDATE)
+        super().end_headers()
+
+def run_server(port=8000, bind="0.0.0.0", root=None):
     """Run a simple HTTP server that can be accessed from other machines."""
-    # Change to the website directory
+    # Change to the website directory (or the given root, e.g. the built _site)
     import os
     from pathlib import Path
     os.chdir(Path(__file__).parent)
+    if root:
+        os.chdir(root)
     
-    handler = http.server.SimpleHTTPRequestHandler
+    handler = CachingHandler
     
     with socketserver.TCPServer((bind, port), handler) as httpd:
         print(f"Server running at http://{bind}:{port}/")
@@ -22,6 +39,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run a simple HTTP server")
     parser.add_argument("--port", type=int, default=8000, help="Port to run the server on (default: 8000)")
     parser.add_argument("--bind", default="0.0.0.0", help="Address to bind to (default: 0.0.0.0)")
+    parser.add_argument("--root", default=None,
+                        help="Directory to serve, relative to the website directory (e.g. _site after build.py)")
     
     args = parser.parse_args()
-    run_server(args.port, args.bind)
\ No newline at end of file
+    run_server(args.port, args.bind, args.root)
\ No newline at end of file